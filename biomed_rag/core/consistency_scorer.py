@@ -1,3 +1,11 @@
+import numpy as np
+
+
 def rouge_fact(rouge_f: float, nli_score: float) -> float:
     """ROUGE-Fact defined as product of ROUGE-F and mean NLI score."""
     return max(0.0, min(1.0, rouge_f * nli_score))
+
+
+def rouge_fact_batch(rouge_f, nli_score) -> np.ndarray:
+    """Array-in/array-out `rouge_fact`; element-wise identical to the scalar version (NaN -> 1.0)."""
+    return np.fmax(0.0, np.fmin(1.0, np.multiply(rouge_f, nli_score, dtype=np.float64)))
@@ -0,0 +1,185 @@
+"""Pluggable NLI (claim, evidence) entailment scoring with a persistent cache.
+
+A backend is any object with a ``model_name`` attribute and
+``score_batch(pairs) -> List[float]`` returning entailment probabilities for
+(claim, evidence) pairs. `CachedNLIScorer` puts an in-memory LRU and an
+optional SQLite file in front of it so a pair is never scored twice, even
+across restarts.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ..data.preprocess import tokenize
+from ..tracing import NULL_TRACER
+
+Pair = Tuple[str, str]
+
+
+class LexicalNLIBackend:
+    """Deterministic local stand-in: share of claim tokens supported by the evidence."""
+    model_name = "lexical-overlap-v1"
+
+    def score_batch(self, pairs: Sequence[Pair]) -> List[float]:
+        out = []
+        for claim, evidence in pairs:
+            c = set(tokenize(claim))
+            out.append(len(c & set(tokenize(evidence))) / len(c) if c else 0.0)
+        return out
+
+
+class HFNLIBackend:
+    """Entailment probability from a Hugging Face sequence-classification model."""
+
+    def __init__(self, model_name: str = "roberta-large-mnli", batch_size: int = 16, device: int = -1):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.device = device
+        self._pipe = None
+
+    def score_batch(self, pairs: Sequence[Pair]) -> List[float]:  # pragma: no cover
+        if self._pipe is None:
+            try:
+                from transformers import pipeline  # type: ignore
+            except Exception as e:
+                raise ImportError("transformers required; install with `pip install transformers`.") from e
+            self._pipe = pipeline("text-classification", model=self.model_name, top_k=None, device=self.device)
+        inputs = [{"text": evidence, "text_pair": claim} for claim, evidence in pairs]
+        outs = self._pipe(inputs, batch_size=self.batch_size, truncation=True)
+        return [next((o["score"] for o in out if o["label"].lower().startswith("entail")), 0.0) for out in outs]
+
+
+def cache_key(claim: str, evidence: str, model_name: str) -> str:
+    return hashlib.sha256("\0".join((model_name, claim, evidence)).encode()).hexdigest()
+
+
+class NLICache:
+    """In-memory LRU in front of an optional SQLite table of key -> score."""
+
+    _CHUNK = 500  # stay below SQLite's bound-parameter limit
+
+    def __init__(self, path: Optional[str] = None, lru_size: int = 65536):
+        self.lru_size = lru_size
+        self._lru: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if path is not None:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS nli_cache (key TEXT PRIMARY KEY, score REAL NOT NULL)")
+            self._db.commit()
+
+    def _remember(self, key: str, score: float):
+        self._lru[key] = score
+        self._lru.move_to_end(key)
+        if len(self._lru) > self.lru_size:
+            self._lru.popitem(last=False)
+
+    def get_many(self, keys: Iterable[str]) -> Tuple[Dict[str, float], int]:
+        """Return found scores and how many of them came from the LRU."""
+        found: Dict[str, float] = {}
+        missing = []
+        with self._lock:
+            for k in keys:
+                if k in self._lru:
+                    self._lru.move_to_end(k)
+                    found[k] = self._lru[k]
+                else:
+                    missing.append(k)
+            lru_hits = len(found)
+            if self._db is not None:
+                for i in range(0, len(missing), self._CHUNK):
+                    chunk = missing[i:i + self._CHUNK]
+                    q = f"SELECT key, score FROM nli_cache WHERE key IN ({','.join('?' * len(chunk))})"
+                    for k, s in self._db.execute(q, chunk):
+                        found[k] = s
+                        self._remember(k, s)
+        return found, lru_hits
+
+    def put_many(self, items: Dict[str, float]):
+        with self._lock:
+            for k, s in items.items():
+                self._remember(k, s)
+            if self._db is not None and items:
+                self._db.executemany("INSERT OR REPLACE INTO nli_cache VALUES (?, ?)", items.items())
+                self._db.commit()
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+class CachedNLIScorer:
+    """Scores (claim, evidence) pairs through `cache`, calling `backend` only for misses."""
+
+    def __init__(self, backend=None, cache: Optional[NLICache] = None, tracer=None):
+        self.backend = backend if backend is not None else LexicalNLIBackend()
+        self.cache = cache if cache is not None else NLICache()
+        self.tracer = tracer if tracer is not None else NULL_TRACER
+
+    def score_batch(self, pairs: Sequence[Pair]) -> List[float]:
+        model = self.backend.model_name
+        keys = [cache_key(c, e, model) for c, e in pairs]
+        found, lru_hits = self.cache.get_many(dict.fromkeys(keys))
+        misses: Dict[str, Pair] = {}
+        for k, p in zip(keys, pairs):
+            if k not in found and k not in misses:
+                misses[k] = p
+        if misses:
+            scores = self.backend.score_batch(list(misses.values()))
+            computed = dict(zip(misses, scores))
+            self.cache.put_many(computed)
+            found.update(computed)
+        self.tracer.incr("nli_cache_hits", lru_hits)
+        self.tracer.incr("nli_disk_hits", len(found) - lru_hits - len(misses))
+        self.tracer.incr("nli_model_pairs", len(misses))
+        return [found[k] for k in keys]
+
+    def score(self, claim: str, evidence: str) -> float:
+        return self.score_batch([(claim, evidence)])[0]
+
+    def mean_entailment(self, claim: str, evidence: Iterable[str]) -> float:
+        """Mean entailment of `claim` over the evidence passages (0.0 if none)."""
+        scores = self.score_batch([(claim, e) for e in evidence])
+        return sum(scores) / len(scores) if scores else 0.0
+
+
+def build_nli_scorer(model_name: Optional[str] = None, cache_path: Optional[str] = None,
+                     tracer=None) -> CachedNLIScorer:
+    """Scorer for `model_name` (the lexical stand-in if None or "lexical"), cached in `cache_path`.
+
+    Any other model name is loaded through `HFNLIBackend`. With a
+    `cache_path` the SQLite tier is shared across processes and restarts.
+    """
+    if model_name in (None, "lexical", LexicalNLIBackend.model_name):
+        backend = LexicalNLIBackend()
+    else:
+        backend = HFNLIBackend(model_name)
+    if cache_path:
+        os.makedirs(os.path.dirname(os.path.abspath(cache_path)), exist_ok=True)
+    return CachedNLIScorer(backend, NLICache(cache_path or None), tracer=tracer)
+
+
+def nli_config(config, model_name: Optional[str] = None,
+               cache_path: Optional[str] = None) -> Tuple[Optional[str], Optional[str]]:
+    """(model_name, cache_path) for `build_nli_scorer` from the ``fact_checking`` block.
+
+    The model is ``nli_model_name`` when ``nli_backend`` is "hf" (else the
+    lexical stand-in); the cache is ``nli_cache_path``. Non-None arguments
+    override the config, e.g. CLI flags (``cache_path=""`` disables the cache).
+    """
+    fc = config.get("fact_checking", {}) or {}
+    if model_name is None and fc.get("nli_backend", "lexical") == "hf":
+        model_name = fc.get("nli_model_name")
+    if cache_path is None:
+        cache_path = fc.get("nli_cache_path")
+    return model_name, cache_path
+
+
+def nli_scorer_from_config(config, tracer=None) -> CachedNLIScorer:
+    """`build_nli_scorer` from ``fact_checking.nli_backend`` / ``nli_model_name`` / ``nli_cache_path``."""
+    return build_nli_scorer(*nli_config(config), tracer=tracer)
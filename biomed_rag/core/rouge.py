@@ -0,0 +1,134 @@
+"""In-package ROUGE-1/2/L F-measure over interned token ids.
+
+ROUGE-L uses a bit-parallel LCS (Allison–Dix / Hyyrö): one Python big-int
+holds a bit per reference token, so each candidate token costs a handful of
+word-parallel operations instead of a DP row.
+"""
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ..data.preprocess import TokenBatch, Vocabulary, tokenize_batch
+
+ROUGE_TYPES = ("rouge1", "rouge2", "rougeL")
+
+
+@dataclass(frozen=True)
+class RougeScore:
+    precision: float
+    recall: float
+    fmeasure: float
+
+
+def _score(overlap: int, n_cand: int, n_ref: int) -> RougeScore:
+    p = overlap / n_cand if n_cand else 0.0
+    r = overlap / n_ref if n_ref else 0.0
+    f = 2 * p * r / (p + r) if p + r > 0 else 0.0
+    return RougeScore(p, r, f)
+
+
+def match_masks(ref: Sequence[int]) -> Dict[int, int]:
+    """Bit mask of reference positions for every token id in `ref`."""
+    masks: Dict[int, int] = {}
+    for i, t in enumerate(ref):
+        masks[t] = masks.get(t, 0) | (1 << i)
+    return masks
+
+
+def lcs_length(cand: Sequence[int], ref: Sequence[int], masks: Dict[int, int] = None) -> int:
+    """Length of the longest common subsequence, O(len(cand) * len(ref) / wordsize)."""
+    if not cand or not ref:
+        return 0
+    if masks is None:
+        masks = match_masks(ref)
+    full = (1 << len(ref)) - 1
+    v = full
+    for t in cand:
+        u = v & masks.get(t, 0)
+        v = ((v + u) | (v - u)) & full
+    return len(ref) - bin(v).count("1")
+
+
+def _ngrams(ids: Sequence[int], n: int) -> Counter:
+    return Counter(zip(*(ids[i:] for i in range(n))))
+
+
+def rouge_n(cand: Sequence[int], ref: Sequence[int], n: int) -> RougeScore:
+    c, r = _ngrams(cand, n), _ngrams(ref, n)
+    overlap = sum((c & r).values())
+    return _score(overlap, sum(c.values()), sum(r.values()))
+
+
+def rouge_l(cand: Sequence[int], ref: Sequence[int], masks: Dict[int, int] = None) -> RougeScore:
+    return _score(lcs_length(cand, ref, masks), len(cand), len(ref))
+
+
+class RougeScorer:
+    """Tokenizes with `preprocess.tokenize` and interns tokens into a shared `Vocabulary`."""
+
+    def __init__(self, rouge_types: Iterable[str] = ROUGE_TYPES, vocab: Optional[Vocabulary] = None):
+        self.rouge_types = tuple(rouge_types)
+        unknown = set(self.rouge_types) - set(ROUGE_TYPES)
+        if unknown:
+            raise ValueError(f"Unsupported ROUGE types: {sorted(unknown)}")
+        self.vocab = vocab if vocab is not None else Vocabulary()
+
+    def ids(self, text: str) -> List[int]:
+        return self.vocab.ids(text)
+
+    def _score_ids(self, cand: List[int], ref: List[int], masks: Dict[int, int] = None) -> Dict[str, RougeScore]:
+        out = {}
+        for rt in self.rouge_types:
+            out[rt] = rouge_l(cand, ref, masks) if rt == "rougeL" else rouge_n(cand, ref, int(rt[-1]))
+        return out
+
+    def score(self, candidate: str, reference: str) -> Dict[str, RougeScore]:
+        return self._score_ids(self.ids(candidate), self.ids(reference))
+
+    def score_multi(self, candidate: str, references: Iterable[str]) -> Dict[str, RougeScore]:
+        """Best score per ROUGE type (by F-measure) against any of `references`."""
+        cand = self.ids(candidate)
+        best = {rt: RougeScore(0.0, 0.0, 0.0) for rt in self.rouge_types}
+        for ref in references:
+            for rt, s in self._score_ids(cand, self.ids(ref)).items():
+                if s.fmeasure > best[rt].fmeasure:
+                    best[rt] = s
+        return best
+
+    def score_batch(self, pairs: Iterable[Tuple[str, str]]) -> List[Dict[str, RougeScore]]:
+        """Score many (candidate, reference) pairs.
+
+        All distinct texts go through one `tokenize_batch` pass and each
+        distinct reference's LCS match masks are built once, so repeated
+        evidence is cheap.
+        """
+        pairs = list(pairs)
+        slot: Dict[str, int] = {}
+        for c, r in pairs:
+            slot.setdefault(c, len(slot))
+            slot.setdefault(r, len(slot))
+        batch = tokenize_batch(slot, self.vocab)
+        ids = [batch[i].tolist() for i in range(len(batch))]
+        mask_cache: Dict[int, Dict[int, int]] = {}
+        out = []
+        for cand_text, ref_text in pairs:
+            j = slot[ref_text]
+            masks = mask_cache.get(j)
+            if masks is None:
+                masks = mask_cache[j] = match_masks(ids[j])
+            out.append(self._score_ids(ids[slot[cand_text]], ids[j], masks))
+        return out
+
+    def score_token_batch(self, candidates: TokenBatch, references: TokenBatch) -> List[Dict[str, RougeScore]]:
+        """Score row i of `candidates` against row i of `references` (same vocabulary)."""
+        if candidates.vocab is not references.vocab:
+            raise ValueError("Token batches must share a vocabulary")
+        if len(candidates) != len(references):
+            raise ValueError("Token batches must have the same number of rows")
+        return [self._score_ids(c.tolist(), r.tolist()) for c, r in zip(candidates, references)]
+
+
+def rouge_f(answer: str, evidence: Iterable[str], scorer: RougeScorer = None) -> float:
+    """ROUGE-L F-measure of `answer` against the best-matching evidence passage."""
+    scorer = scorer or RougeScorer(("rougeL",))
+    return scorer.score_multi(answer, evidence)["rougeL"].fmeasure
@@ -0,0 +1,89 @@
+"""Fingerprint-keyed cache of parsed datasets.
+
+The parsed value of a source file is pickled to ``<dir>/.cache/<name>.<kind>.pkl``
+behind a small header holding the key: source path, size, mtime_ns, a hash
+of the preprocessing config and `CACHE_VERSION`. A mismatching or unreadable
+cache is rebuilt; writes go through a temp file and `os.replace`, so
+concurrent readers never see a partial pickle.
+"""
+import hashlib
+import json
+import os
+import pickle
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+from ..utils import iter_json_array
+
+CACHE_VERSION = 1
+T = TypeVar("T")
+
+
+def config_hash(config: Any) -> str:
+    return hashlib.sha256(json.dumps(config, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+def fingerprint(path: str, config: Any = None, kind: str = "parsed") -> Dict[str, Any]:
+    st = os.stat(path)
+    return {
+        "version": CACHE_VERSION,
+        "path": os.path.abspath(path),
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "kind": kind,
+        "config": config_hash(config),
+    }
+
+
+def cache_path(path: str, kind: str = "parsed") -> Path:
+    src = Path(path)
+    return src.parent / ".cache" / f"{src.name}.{kind}.pkl"
+
+
+def cached_load(
+    path: str,
+    build: Callable[[str], T],
+    config: Any = None,
+    kind: str = "parsed",
+    enabled: bool = True,
+) -> T:
+    """Return `build(path)`, served from the on-disk cache while `path` and `config` are unchanged."""
+    if not enabled:
+        return build(path)
+    key = fingerprint(path, config, kind)
+    cp = cache_path(path, kind)
+    try:
+        with open(cp, "rb") as f:
+            if pickle.load(f) == key:
+                return pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, IndexError):
+        pass
+    value = build(path)
+    tmp = cp.with_name(f"{cp.name}.{os.getpid()}.tmp")
+    try:
+        cp.parent.mkdir(exist_ok=True)
+        with open(tmp, "wb") as f:
+            pickle.dump(key, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, cp)
+    except OSError:  # read-only data directory: just skip caching
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+    return value
+
+
+def parse_json_array(path: str) -> List[Any]:
+    return list(iter_json_array(path))
+
+
+def clear_cache(path: str, kind: Optional[str] = None) -> int:
+    """Delete cached entries for `path` (all kinds by default); returns how many were removed."""
+    src = Path(path)
+    pattern = f"{src.name}.{kind}.pkl" if kind else f"{src.name}.*.pkl"
+    removed = 0
+    for cp in (src.parent / ".cache").glob(pattern):
+        cp.unlink()
+        removed += 1
+    return removed
@@ -1,16 +1,32 @@
-from typing import List, Dict
+from typing import List, Dict, Iterator, Optional
 from pathlib import Path
-import json
+from itertools import islice
 
+from ..utils import iter_json_array
+from .cache import cached_load, parse_json_array
 
-def load_fact_pairs(root: str, max_items: int = 200) -> List[Dict]:
-    path = Path(root) / "data" / "samples" / "fact_pairs.json"
+
+def _source(root: str) -> Path:
+    return Path(root) / "data" / "samples" / "fact_pairs.json"
+
+
+def iter_fact_pairs(root: str) -> Iterator[Dict]:
+    """Yield claim/evidence pairs lazily from the JSON array on disk (or synthetic ones)."""
+    path = _source(root)
     if not path.exists():
         # synthetic supportive/refuting pairs
-        return [
+        yield from [
             {"claim": "Aspirin lowers cardiovascular mortality", "evidence": "Meta-analysis of RCTs shows reduction.", "label": "SUPPORT"},
             {"claim": "Antibiotics cure viral influenza", "evidence": "Trials show no efficacy against viruses.", "label": "REFUTE"},
         ]
-    with open(path) as f:
-        data = json.load(f)
-    return data[:max_items]
+        return
+    yield from iter_json_array(str(path))
+
+
+def load_fact_pairs(root: str, max_items: Optional[int] = 200, use_cache: bool = True) -> List[Dict]:
+    path = _source(root)
+    if max_items is not None:  # stream only the head; the cache would parse the whole file
+        return list(islice(iter_fact_pairs(root), max_items))
+    if use_cache and path.exists():
+        return cached_load(str(path), parse_json_array)
+    return list(iter_fact_pairs(root))
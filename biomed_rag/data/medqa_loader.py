@@ -1,18 +1,34 @@
-from typing import List, Dict
+from typing import List, Dict, Iterator, Optional
 from pathlib import Path
-import json
+from itertools import islice
+
+from ..utils import iter_json_array
+from .cache import cached_load, parse_json_array
 
 SPECIALTIES = ["cardiology", "neurology", "infectious", "oncology"]
 
 
-def load_medqa(root: str, max_items: int = 50) -> List[Dict]:
-    path = Path(root) / "data" / "samples" / "medqa.json"
+def _source(root: str) -> Path:
+    return Path(root) / "data" / "samples" / "medqa.json"
+
+
+def iter_medqa(root: str) -> Iterator[Dict]:
+    """Yield MedQA records lazily from the JSON array on disk (or synthetic ones)."""
+    path = _source(root)
     if not path.exists():
         # synthetic examples
-        return [
+        yield from [
             {"question": "A 60-year-old with exertional angina: next test?", "options": ["ECG", "Stress echo", "MRI", "Biopsy"], "answer": 1, "specialty": "cardiology"},
             {"question": "Young patient new seizure: first-line imaging?", "options": ["CT", "MRI", "PET", "X-ray"], "answer": 1, "specialty": "neurology"},
         ]
-    with open(path) as f:
-        data = json.load(f)
-    return data[:max_items]
+        return
+    yield from iter_json_array(str(path))
+
+
+def load_medqa(root: str, max_items: Optional[int] = 50, use_cache: bool = True) -> List[Dict]:
+    path = _source(root)
+    if max_items is not None:  # stream only the head; the cache would parse the whole file
+        return list(islice(iter_medqa(root), max_items))
+    if use_cache and path.exists():
+        return cached_load(str(path), parse_json_array)
+    return list(iter_medqa(root))
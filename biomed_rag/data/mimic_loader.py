@@ -1,20 +1,45 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator
 from pathlib import Path
 
-from ..utils import read_jsonl, privacy_guard
+from ..deid import DEFAULT_ENGINE
+from ..utils import read_jsonl_parallel, privacy_guard_batch
+from .cache import cached_load
 
 
-def load_mimic_samples(root: str) -> List[Dict[str, Any]]:
-    """Load sample de-identified EHRs (JSONL) with minimal FHIR-like fields."""
-    fp = Path(root) / "data" / "samples" / "mimic_samples.jsonl"
+def _to_samples(recs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    notes = privacy_guard_batch([r.get("note", "") for r in recs])
+    return [
+        {"patient_id": r.get("patient_id", "P0"), "note": note, "fhir": r.get("fhir", {})}
+        for r, note in zip(recs, notes)
+    ]
+
+
+def _source(root: str) -> Path:
+    return Path(root) / "data" / "samples" / "mimic_samples.jsonl"
+
+
+def iter_mimic_samples(
+    root: str,
+    workers: int = 1,
+    ordered: bool = True,
+    chunk_bytes: int = 8 << 20,
+) -> Iterator[Dict[str, Any]]:
+    """Stream de-identified EHR samples; with `workers` > 1, chunks are parsed and scrubbed in a process pool."""
+    fp = _source(root)
+    if not fp.exists():
+        return
+    yield from read_jsonl_parallel(str(fp), transform=_to_samples, workers=workers,
+                                   chunk_bytes=chunk_bytes, ordered=ordered)
+
+
+def load_mimic_samples(root: str, use_cache: bool = True) -> List[Dict[str, Any]]:
+    """Load sample de-identified EHRs (JSONL) with minimal FHIR-like fields.
+
+    The scrubbed samples are cached next to the source, keyed on the default
+    de-identification engine as well as the file.
+    """
+    fp = _source(root)
     if not fp.exists():
         return []
-    out = []
-    for rec in read_jsonl(str(fp)):
-        note = privacy_guard(rec.get("note", ""), enable=True)
-        out.append({
-            "patient_id": rec.get("patient_id", "P0"),
-            "note": note,
-            "fhir": rec.get("fhir", {}),
-        })
-    return out
+    return cached_load(str(fp), lambda _: list(iter_mimic_samples(root, workers=1)),
+                       config={"deid": DEFAULT_ENGINE.fingerprint}, kind="deid", enabled=use_cache)
@@ -1,28 +1,155 @@
-from typing import List
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
 import re
 import random
 
-from ..utils import privacy_guard
+import numpy as np
+
+from ..utils import ensure_rng, privacy_guard, privacy_guard_batch
+
+_TOKEN_RE = re.compile(r"\w+")
+NOISY_TOKEN = "<noisy>"
 
 
 def tokenize(text: str) -> List[str]:
-    text = text.lower()
-    return re.findall(r"\w+", text)
+    return _TOKEN_RE.findall(text.lower())
+
+
+class Vocabulary:
+    """Interns tokens to dense int ids (0, 1, ...) in first-seen order."""
+
+    def __init__(self, tokens: Iterable[str] = ()):
+        self.index: Dict[str, int] = {}
+        self.tokens: List[str] = []
+        for t in tokens:
+            self.add(t)
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def __contains__(self, token: str) -> bool:
+        return token in self.index
+
+    def add(self, token: str) -> int:
+        i = self.index.get(token)
+        if i is None:
+            i = self.index[token] = len(self.tokens)
+            self.tokens.append(token)
+        return i
+
+    def ids(self, text: str) -> List[int]:
+        index, tokens = self.index, self.tokens
+        out = []
+        for t in tokenize(text):
+            i = index.get(t)
+            if i is None:
+                i = index[t] = len(tokens)
+                tokens.append(t)
+            out.append(i)
+        return out
+
+    def decode(self, ids: Iterable[int]) -> List[str]:
+        tokens = self.tokens
+        return [tokens[i] for i in ids]
+
+
+@dataclass
+class TokenBatch:
+    """CSR-style token ids: text ``i`` is ``ids[offsets[i]:offsets[i + 1]]``."""
+    ids: np.ndarray      # int32, all texts concatenated
+    offsets: np.ndarray  # int64, len(texts) + 1
+    vocab: Vocabulary
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
 
+    def __getitem__(self, i: int) -> np.ndarray:
+        return self.ids[self.offsets[i]:self.offsets[i + 1]]
 
-def inject_noise(text: str, noise_level: float = 0.1) -> str:
+    def __iter__(self) -> Iterator[np.ndarray]:
+        return (self[i] for i in range(len(self)))
+
+    @property
+    def lengths(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+    def texts(self) -> List[str]:
+        """Space-joined tokens per text (the `inject_noise` output format)."""
+        tokens = self.vocab.tokens
+        ids = self.ids.tolist()
+        off = self.offsets.tolist()
+        return [" ".join([tokens[t] for t in ids[a:b]]) for a, b in zip(off[:-1], off[1:])]
+
+
+def tokenize_batch(texts: Iterable[str], vocab: Optional[Vocabulary] = None) -> TokenBatch:
+    """Tokenize many texts in one pass, interning into `vocab` (new one if None)."""
+    vocab = vocab if vocab is not None else Vocabulary()
+    flat: List[int] = []
+    offsets = [0]
+    for text in texts:
+        flat.extend(vocab.ids(text))
+        offsets.append(len(flat))
+    return TokenBatch(np.asarray(flat, dtype=np.int32), np.asarray(offsets, dtype=np.int64), vocab)
+
+
+def inject_noise(text: str, noise_level: float = 0.1, rng=None) -> str:
+    """Replace ~noise_level of the tokens with <noisy>.
+
+    Draws positions from `rng` (a numpy Generator) when given, otherwise from
+    the global `random` state.
+    """
     tokens = tokenize(text)
     n = max(1, int(len(tokens) * noise_level))
     for _ in range(n):
         if tokens:
-            idx = random.randrange(len(tokens))
-            tokens[idx] = "<noisy>"
+            idx = int(rng.integers(len(tokens))) if rng is not None else random.randrange(len(tokens))
+            tokens[idx] = NOISY_TOKEN
     return " ".join(tokens)
 
 
-def dp_sanitize(text: str, epsilon: float = 1.0) -> str:
+def dp_sanitize(text: str, epsilon: float = 1.0, rng=None) -> str:
     # Placeholder: light de-id + optional perturbation
     t = privacy_guard(text, enable=True)
     if epsilon <= 1.0:
-        t = inject_noise(t, noise_level=0.05)
+        t = inject_noise(t, noise_level=0.05, rng=rng)
     return t
+
+
+def inject_noise_batch(batch: TokenBatch, noise_levels: Sequence[float], rng=None) -> List[TokenBatch]:
+    """Noisy copies of `batch`, one per noise level, drawn in a single vectorized pass.
+
+    Each non-empty text gets exactly ``max(1, int(len * level))`` distinct
+    positions replaced by `NOISY_TOKEN`. One random key per token is shared
+    across levels, so higher levels corrupt a superset of lower levels' positions.
+    """
+    rng = ensure_rng(rng)
+    noisy_id = batch.vocab.add(NOISY_TOKEN)
+    lengths = batch.lengths
+    doc = np.repeat(np.arange(len(batch)), lengths)
+    order = np.lexsort((rng.random(len(batch.ids)), doc))
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = np.arange(len(order)) - batch.offsets[doc[order]]
+    out = []
+    for level in noise_levels:
+        n = np.maximum(1, (lengths * level).astype(np.int64))
+        ids = np.where(rank < n[doc], np.int32(noisy_id), batch.ids)
+        out.append(TokenBatch(ids, batch.offsets, batch.vocab))
+    return out
+
+
+def dp_sanitize_batch(
+    texts: Iterable[str],
+    epsilons: Sequence[float] = (1.0,),
+    rng=None,
+    vocab: Optional[Vocabulary] = None,
+) -> List[TokenBatch]:
+    """Token-level `dp_sanitize` of many texts for each epsilon in `epsilons`.
+
+    Texts are scrubbed and tokenized once; every epsilon <= 1 shares the same
+    noisy batch, the rest share the clean one.
+    """
+    clean = tokenize_batch(privacy_guard_batch(list(texts)), vocab)
+    noisy = None
+    if any(eps <= 1.0 for eps in epsilons):
+        noisy = inject_noise_batch(clean, [0.05], rng)[0]
+    return [noisy if eps <= 1.0 else clean for eps in epsilons]
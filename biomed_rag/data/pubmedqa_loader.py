@@ -1,18 +1,34 @@
-from typing import List, Dict
+from typing import List, Dict, Iterator, Optional
 from pathlib import Path
-import json
+from itertools import islice
 
+from ..utils import iter_json_array
+from .cache import cached_load, parse_json_array
 
-def load_pubmedqa(root: str, max_items: int = 100) -> List[Dict]:
-    """Load or synthesize PubMedQA-style records.
-    If file missing, return synthetic subset.
-    """
-    path = Path(root) / "data" / "samples" / "pubmedqa.json"
+
+def _source(root: str) -> Path:
+    return Path(root) / "data" / "samples" / "pubmedqa.json"
+
+
+def iter_pubmedqa(root: str) -> Iterator[Dict]:
+    """Yield PubMedQA-style records lazily; synthetic subset if the file is missing."""
+    path = _source(root)
     if not path.exists():
-        return [
+        yield from [
             {"question": "Does aspirin reduce risk of MI?", "context": "Study shows modest reduction.", "answer": "yes"},
             {"question": "Is vitamin D linked to fractures?", "context": "Mixed RCT outcomes.", "answer": "maybe"},
         ]
-    with open(path) as f:
-        data = json.load(f)
-    return data[:max_items]
+        return
+    yield from iter_json_array(str(path))
+
+
+def load_pubmedqa(root: str, max_items: Optional[int] = 100, use_cache: bool = True) -> List[Dict]:
+    """Load or synthesize PubMedQA-style records.
+    If file missing, return synthetic subset.
+    """
+    path = _source(root)
+    if max_items is not None:  # stream only the head; the cache would parse the whole file
+        return list(islice(iter_pubmedqa(root), max_items))
+    if use_cache and path.exists():
+        return cached_load(str(path), parse_json_array)
+    return list(iter_pubmedqa(root))
@@ -0,0 +1,175 @@
+"""Dictionary + pattern de-identification in a single pass per note.
+
+Dictionary terms (names, locations, IDs, ...) are matched with an
+Aho–Corasick automaton, so scanning cost does not grow with the number of
+terms; dates, MRNs and phone numbers come from one precompiled regex.
+Overlapping hits are resolved leftmost-longest and the output is assembled
+in one pass.
+"""
+import hashlib
+import json
+import re
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+DEFAULT_PATTERNS: Dict[str, str] = {
+    "DATE": r"\b(?:\d{1,2}[/-]\d{1,2}[/-]\d{2,4}|\d{4}-\d{2}-\d{2})\b",
+    "MRN": r"\b(?:MRN|mrn)[:#\s]*\d{5,10}\b",
+    "PHONE": r"(?:\(\d{3}\)\s?|\b\d{3}[-.\s])\d{3}[-.\s]\d{4}\b",
+}
+
+
+class AhoCorasick:
+    """Multi-pattern exact matcher; `finditer` yields (start, end, pattern_index)."""
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: List[str] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._out: List[int] = [-1]    # longest pattern ending at this state
+        self._fail: List[int] = [0]
+        self._dict: List[int] = [0]    # nearest proper suffix state with an output
+        for p in patterns:
+            self._add(p)
+        self._build()
+
+    def _add(self, pattern: str):
+        if not pattern:
+            return
+        s = 0
+        for c in pattern:
+            nxt = self._goto[s].get(c)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[s][c] = nxt
+                self._goto.append({})
+                self._out.append(-1)
+                self._fail.append(0)
+                self._dict.append(0)
+            s = nxt
+        if self._out[s] == -1:
+            self._out[s] = len(self.patterns)
+            self.patterns.append(pattern)
+
+    def _build(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            s = queue.popleft()
+            for c, t in self._goto[s].items():
+                f = self._fail[s]
+                while f and c not in self._goto[f]:
+                    f = self._fail[f]
+                f = self._goto[f].get(c, 0)
+                self._fail[t] = f if f != t else 0
+                self._dict[t] = f if self._out[f] != -1 else self._dict[f]
+                queue.append(t)
+
+    def finditer(self, text: str) -> Iterator[Tuple[int, int, int]]:
+        goto, fail, out, dict_link = self._goto, self._fail, self._out, self._dict
+        s = 0
+        for i, c in enumerate(text):
+            while s and c not in goto[s]:
+                s = fail[s]
+            s = goto[s].get(c, 0)
+            t = s if out[s] != -1 else dict_link[s]
+            while t:
+                pid = out[t]
+                yield i + 1 - len(self.patterns[pid]), i + 1, pid
+                t = dict_link[t]
+
+
+def _fold(text: str) -> str:
+    # lower-case without changing string length, so offsets stay valid
+    folded = text.lower()
+    if len(folded) == len(text):
+        return folded
+    return "".join(c.lower() if len(c.lower()) == 1 else c for c in text)
+
+
+class DeidEngine:
+    """Replace dictionary terms and PHI patterns in one pass over each note.
+
+    `terms` maps a surface string to its replacement. `patterns` maps a
+    category to a regex; matches become `pattern_replacements[category]`
+    (default ``[CATEGORY]``). With `whole_word`, dictionary hits must not be
+    flanked by word characters.
+    """
+
+    def __init__(
+        self,
+        terms: Optional[Dict[str, str]] = None,
+        patterns: Optional[Dict[str, str]] = None,
+        pattern_replacements: Optional[Dict[str, str]] = None,
+        case_insensitive: bool = False,
+        whole_word: bool = False,
+    ):
+        terms = terms or {}
+        self.case_insensitive = case_insensitive
+        self.whole_word = whole_word
+        keys = [_fold(t) if case_insensitive else t for t in terms]
+        self._replacements = dict(zip(keys, terms.values()))
+        self._automaton = AhoCorasick(keys)
+        patterns = DEFAULT_PATTERNS if patterns is None else patterns
+        self._regex = (
+            re.compile("|".join(f"(?P<{name}>{rx})" for name, rx in patterns.items())) if patterns else None
+        )
+        self._pattern_repl = {name: f"[{name}]" for name in patterns}
+        self._pattern_repl.update(pattern_replacements or {})
+        # identifies the scrubbing behaviour, e.g. for keying caches of de-identified data
+        self.fingerprint = hashlib.sha256(json.dumps(
+            [terms, patterns, self._pattern_repl, case_insensitive, whole_word], sort_keys=True
+        ).encode()).hexdigest()
+
+    @classmethod
+    def from_file(cls, path: str, **kwargs) -> "DeidEngine":
+        """Load terms from a JSON object or a ``term<TAB>replacement`` file."""
+        with open(path) as f:
+            if path.endswith(".json"):
+                terms = json.load(f)
+            else:
+                terms = dict(line.rstrip("\n").split("\t", 1) for line in f if line.strip())
+        return cls(terms, **kwargs)
+
+    def spans(self, text: str) -> List[Tuple[int, int, str]]:
+        """Non-overlapping (start, end, replacement) hits, leftmost-longest first."""
+        hits = []
+        scan = _fold(text) if self.case_insensitive else text
+        patterns = self._automaton.patterns
+        for start, end, pid in self._automaton.finditer(scan):
+            if self.whole_word and (
+                (start > 0 and (text[start - 1].isalnum() or text[start - 1] == "_"))
+                or (end < len(text) and (text[end].isalnum() or text[end] == "_"))
+            ):
+                continue
+            hits.append((start, end, self._replacements[patterns[pid]]))
+        if self._regex is not None:
+            for m in self._regex.finditer(text):
+                hits.append((m.start(), m.end(), self._pattern_repl[m.lastgroup]))
+        hits.sort(key=lambda h: (h[0], h[0] - h[1]))
+        chosen = []
+        last_end = 0
+        for h in hits:
+            if h[0] >= last_end and h[1] > h[0]:
+                chosen.append(h)
+                last_end = h[1]
+        return chosen
+
+    def scrub(self, text: str) -> str:
+        pieces = []
+        pos = 0
+        for start, end, repl in self.spans(text):
+            pieces.append(text[pos:start])
+            pieces.append(repl)
+            pos = end
+        if not pieces:
+            return text
+        pieces.append(text[pos:])
+        return "".join(pieces)
+
+    def scrub_batch(self, texts: Iterable[str]) -> List[str]:
+        return [self.scrub(t) for t in texts]
+
+
+# Placeholder dictionary used by `utils.privacy_guard` for the bundled samples.
+# Dictionary terms only, matching the original str.replace chain; pass
+# `engine=DeidEngine(terms)` to also scrub DEFAULT_PATTERNS (dates, MRNs, phones).
+DEFAULT_ENGINE = DeidEngine({"Patient": "P.", "Name": "N."}, patterns={})
@@ -0,0 +1,298 @@
+"""Parallel, resumable benchmark runner over MedQA, PubMedQA and FactCC/SciFact.
+
+Items are sharded across a process pool and every result is appended to a
+JSONL file as soon as its chunk finishes. Re-running with the same output
+skips items recorded in its ``.progress`` file, so a crash only loses
+in-flight chunks.
+
+    python -m biomed_rag.eval.benchmark --root . --out bench.jsonl --workers 4
+"""
+import argparse
+import json
+import os
+from itertools import islice
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from ..data.factcc_scifact import iter_fact_pairs
+from ..data.medqa_loader import SPECIALTIES, iter_medqa
+from ..data.pubmedqa_loader import iter_pubmedqa
+from ..rag_wrapper import RAGSystem
+from ..utils import Config, query_rng, read_jsonl
+from .metrics import StreamingAggregator
+
+DATASETS = ("medqa", "pubmedqa", "factcc")
+
+
+def completed_ids(path: str, key: str = "id") -> Set[Any]:
+    """Ids already written to `path`; drops a trailing partial line left by a crash.
+
+    Only used to resume outputs that predate their ``.progress`` file.
+    """
+    if not os.path.exists(path):
+        return set()
+    with open(path, "rb+") as f:
+        size = f.seek(0, os.SEEK_END)
+        if size:
+            f.seek(max(0, size - (1 << 20)))
+            tail = f.read()
+            if not tail.endswith(b"\n"):
+                cut = tail.rfind(b"\n")
+                f.truncate(size - len(tail) + cut + 1 if cut >= 0 else 0)
+    return {rec[key] for rec in read_jsonl(path) if key in rec}
+
+
+def progress_path(out_path: str) -> str:
+    return f"{out_path}.progress"
+
+
+class Progress:
+    """Completed item positions: a contiguous prefix `done` plus out-of-order [start, end) ranges.
+
+    Chunks are submitted in order, so `ranges` only holds chunks that
+    finished ahead of an in-flight one and stays bounded by the pool window.
+    `bytes` is the output size covered by this state.
+    """
+
+    def __init__(self, done: int = 0, ranges: Iterable[Iterable[int]] = (), bytes: int = 0):
+        self.done = done
+        self.ranges: List[List[int]] = sorted([list(r) for r in ranges])
+        self.bytes = bytes
+        self._collapse()
+
+    def add(self, start: int, end: int):
+        self.ranges.append([start, end])
+        self.ranges.sort()
+        self._collapse()
+
+    def _collapse(self):
+        while self.ranges and self.ranges[0][0] <= self.done:
+            self.done = max(self.done, self.ranges.pop(0)[1])
+
+    def __contains__(self, pos: int) -> bool:
+        return pos < self.done or any(a <= pos < b for a, b in self.ranges)
+
+    def save(self, path: str):
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"done": self.done, "ranges": self.ranges, "bytes": self.bytes}, f)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional["Progress"]:
+        try:
+            with open(path) as f:
+                return cls(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            return None
+
+
+def _chunks(items: Iterable[Dict[str, Any]], progress: Progress, legacy_done: Set[Any], key: str,
+            size: int) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+    """(start position, chunk) runs of pending items; each chunk covers [start, start + len)."""
+    chunk: List[Dict[str, Any]] = []
+    start = progress.done
+    for pos, it in enumerate(islice(items, progress.done, None), progress.done):
+        skip = pos in progress
+        if not skip and legacy_done and it[key] in legacy_done:
+            progress.add(pos, pos + 1)
+            skip = True
+        if skip:
+            if chunk:
+                yield start, chunk
+                chunk = []
+            continue
+        if not chunk:
+            start = pos
+        chunk.append(it)
+        if len(chunk) == size:
+            yield start, chunk
+            chunk = []
+    if chunk:
+        yield start, chunk
+
+
+def run_sharded(
+    items: Iterable[Dict[str, Any]],
+    work_fn: Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]],
+    out_path: str,
+    workers: int = 1,
+    chunk_size: int = 16,
+    initializer: Optional[Callable] = None,
+    initargs: tuple = (),
+    key: str = "id",
+) -> int:
+    """Run `work_fn` over chunks of `items` not yet in `out_path`, appending results.
+
+    `work_fn` and `initializer` must be picklable module-level functions.
+    `items` may be a lazy iterable; at most ``2 * workers`` chunks are in
+    flight, so memory stays bounded. Progress is tracked by item position in
+    ``<out_path>.progress``, so a re-run must see `items` in the same order;
+    results written after the last progress update (a crash mid-chunk) are
+    truncated away and recomputed. Returns the number of results written.
+    """
+    ppath = progress_path(out_path)
+    progress = Progress.load(ppath)
+    size = os.path.getsize(out_path) if os.path.exists(out_path) else None
+    legacy_done: Set[Any] = set()
+    if progress is None or size is None or size < progress.bytes:
+        progress = Progress()
+        if size is not None:  # no (or stale) progress file: resume by id
+            legacy_done = completed_ids(out_path, key)
+            progress.bytes = os.path.getsize(out_path)
+    elif size > progress.bytes:
+        with open(out_path, "rb+") as f:
+            f.truncate(progress.bytes)
+    chunks = _chunks(items, progress, legacy_done, key, chunk_size)
+    written = 0
+    Path(out_path).parent.mkdir(parents=True, exist_ok=True)
+    with open(out_path, "a") as out:
+        def emit(start, n, results):
+            nonlocal written
+            for rec in results:
+                out.write(json.dumps(rec) + "\n")
+            out.flush()
+            written += len(results)
+            progress.bytes = out.tell()
+            progress.add(start, start + n)
+            progress.save(ppath)
+
+        if workers <= 1:
+            if initializer is not None:
+                initializer(*initargs)
+            for start, chunk in chunks:
+                emit(start, len(chunk), work_fn(chunk))
+            return written
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs) as pool:
+            running = {}
+            exhausted = False
+            while not exhausted or running:
+                while not exhausted and len(running) < 2 * workers:
+                    nxt = next(chunks, None)
+                    if nxt is None:
+                        exhausted = True
+                    else:
+                        running[pool.submit(work_fn, nxt[1])] = (nxt[0], len(nxt[1]))
+                if not running:
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    emit(*running.pop(fut), fut.result())
+    return written
+
+
+def load_items(root: str, datasets: Iterable[str] = DATASETS, max_items: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Normalise dataset records into {id, dataset, specialty, query, evidence} items.
+
+    Every record is used unless `max_items` caps each dataset.
+    """
+    def take(recs: Iterator[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        return recs if max_items is None else islice(recs, max_items)
+
+    items = []
+    for name in datasets:
+        if name == "medqa":
+            for i, r in enumerate(take(iter_medqa(root))):
+                items.append({"id": f"medqa:{i}", "dataset": name, "specialty": r.get("specialty"),
+                              "query": r["question"], "evidence": list(r.get("options", []))})
+        elif name == "pubmedqa":
+            for i, r in enumerate(take(iter_pubmedqa(root))):
+                items.append({"id": f"pubmedqa:{i}", "dataset": name, "specialty": r.get("specialty"),
+                              "query": r["question"], "evidence": [r.get("context", "")]})
+        elif name == "factcc":
+            for i, r in enumerate(take(iter_fact_pairs(root))):
+                items.append({"id": f"factcc:{i}", "dataset": name, "specialty": r.get("specialty"),
+                              "query": r["claim"], "evidence": [r.get("evidence", "")]})
+        else:
+            raise ValueError(f"Unknown dataset: {name}")
+    for idx, it in enumerate(items):
+        it["index"] = idx
+    return items
+
+
+_WORKER: Dict[str, Any] = {}
+
+
+def _init_worker(corpus: List[str], seed: int, max_iterations: int):
+    _WORKER["rag"] = RAGSystem(corpus, max_iterations=max_iterations)
+    _WORKER["seed"] = seed
+
+
+def _run_items(chunk: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    rag, seed = _WORKER["rag"], _WORKER["seed"]
+    out = []
+    for it in chunk:
+        res = rag.process(it["query"], explain=False, rng=query_rng(seed, it["index"]))
+        out.append({
+            "id": it["id"],
+            "dataset": it["dataset"],
+            "specialty": it["specialty"],
+            "query": it["query"],
+            "fact_score": res.fact_score,
+            "trust": res.trust,
+            **res.metadata,
+        })
+    return out
+
+
+def summarize(path: str) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """Per-dataset and per-specialty (`SPECIALTIES`, else "other") aggregates of a results file."""
+    by_dataset: Dict[str, StreamingAggregator] = {}
+    by_specialty: Dict[str, StreamingAggregator] = {}
+    for rec in read_jsonl(path):
+        by_dataset.setdefault(rec["dataset"], StreamingAggregator()).update(rec)
+        spec = rec.get("specialty") if rec.get("specialty") in SPECIALTIES else "other"
+        by_specialty.setdefault(spec, StreamingAggregator()).update(rec)
+    return {
+        "by_dataset": {k: dict(v.result(), n=v.stats["trust"].count) for k, v in by_dataset.items()},
+        "by_specialty": {k: dict(v.result(), n=v.stats["trust"].count) for k, v in by_specialty.items()},
+    }
+
+
+def run_benchmark(
+    root: str,
+    out_path: str,
+    datasets: Iterable[str] = DATASETS,
+    workers: int = 1,
+    chunk_size: int = 16,
+    max_items: Optional[int] = None,
+    seed: int = 42,
+    max_iterations: int = 1,
+) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """Run (or resume) the benchmark and return `summarize` of the full output."""
+    items = load_items(root, datasets, max_items)
+    # retrieval corpus: every evidence passage of the selected datasets
+    corpus = list(dict.fromkeys(e for it in items for e in it["evidence"] if e))
+    run_sharded(items, _run_items, out_path, workers=workers, chunk_size=chunk_size,
+                initializer=_init_worker, initargs=(corpus, seed, max_iterations))
+    return summarize(out_path)
+
+
+def main(argv=None):  # pragma: no cover
+    ap = argparse.ArgumentParser(description="Run the RAG pipeline over the benchmark datasets.")
+    ap.add_argument("--root", default=".")
+    ap.add_argument("--out", default="benchmark_results.jsonl")
+    ap.add_argument("--datasets", nargs="+", default=list(DATASETS), choices=DATASETS)
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--chunk-size", type=int, default=16)
+    ap.add_argument("--max-items", type=int, default=None)
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--config", default="config.yaml")
+    ap.add_argument("--max-iterations", type=int, default=None, help="default: inference.max_iterations of --config")
+    args = ap.parse_args(argv)
+    if args.max_iterations is None:
+        args.max_iterations = Config.load(args.config).get("inference", {}).get("max_iterations", 1)
+
+    summary = run_benchmark(args.root, args.out, args.datasets, args.workers, args.chunk_size,
+                            args.max_items, args.seed, args.max_iterations)
+    summary_path = str(Path(args.out).with_suffix(".summary.json"))
+    with open(summary_path, "w") as f:
+        json.dump(summary, f, indent=2)
+    print(json.dumps(summary, indent=2))
+    print(f"✅ Results in {args.out}, aggregates in {summary_path}")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
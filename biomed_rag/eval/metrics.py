@@ -1,6 +1,10 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable
 import statistics
 
+import numpy as np
+
+from ..utils import read_jsonl
+
 
 def pearson_r(x: List[float], y: List[float]) -> float:
     """Simplified Pearson correlation coefficient."""
@@ -21,6 +25,23 @@ def pearson_r(x: List[float], y: List[float]) -> float:
     return numerator / (denom_x * denom_y) ** 0.5
 
 
+def pearson_r_vectorized(x, y) -> np.ndarray:
+    """Pearson r along the last axis, e.g. one value per bootstrap resample row.
+
+    Like `pearson_r`, returns 0.0 where either input has zero variance.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    xc = x - x.mean(axis=-1, keepdims=True)
+    yc = y - y.mean(axis=-1, keepdims=True)
+    num = (xc * yc).sum(axis=-1)
+    denom = np.sqrt((xc ** 2).sum(axis=-1) * (yc ** 2).sum(axis=-1))
+    # test constancy exactly; mean subtraction can leave rounding residue
+    degenerate = (np.ptp(x, axis=-1) == 0) | (np.ptp(y, axis=-1) == 0) | (denom == 0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(degenerate, 0.0, num / np.where(degenerate, 1.0, denom))
+
+
 def auc_roc_mock(predictions: List[float], labels: List[int]) -> float:
     """Mock AUC-ROC for testing (not a real implementation)."""
     if not predictions or not labels:
@@ -30,6 +51,71 @@ def auc_roc_mock(predictions: List[float], labels: List[int]) -> float:
     return correct / len(labels)
 
 
+def auc_roc(predictions, labels) -> float:
+    """Exact AUC-ROC via the Mann-Whitney U statistic, O(n log n).
+
+    Tied predictions receive their average rank, i.e. a positive/negative tie
+    counts as half a correct ordering. Returns 0.5 if either class is empty.
+    """
+    p = np.asarray(predictions, dtype=np.float64)
+    y = np.asarray(labels).astype(bool)
+    n_pos = int(y.sum())
+    n_neg = len(y) - n_pos
+    if n_pos == 0 or n_neg == 0:
+        return 0.5
+    order = np.argsort(p, kind="mergesort")
+    sorted_p = p[order]
+    # average 1-based rank for each run of tied values
+    _, first, counts = np.unique(sorted_p, return_index=True, return_counts=True)
+    avg_rank = first + (counts + 1) / 2.0
+    ranks = np.empty(len(p))
+    ranks[order] = np.repeat(avg_rank, counts)
+    u = ranks[y].sum() - n_pos * (n_pos + 1) / 2.0
+    return float(u / (n_pos * n_neg))
+
+
+class StreamingAUC:
+    """Approximate AUC-ROC from fixed-bin score histograms of each class.
+
+    Memory is O(n_bins) regardless of how many predictions are seen, and
+    accumulators from parallel workers can be combined with `merge`. Scores
+    falling in the same bin are treated as ties, so the error is bounded by
+    the mass of positive/negative pairs sharing a bin.
+    """
+
+    def __init__(self, n_bins: int = 1000, lo: float = 0.0, hi: float = 1.0):
+        self.n_bins = n_bins
+        self.lo = lo
+        self.hi = hi
+        self.pos = np.zeros(n_bins, dtype=np.int64)
+        self.neg = np.zeros(n_bins, dtype=np.int64)
+
+    def update(self, predictions, labels) -> "StreamingAUC":
+        p = np.asarray(predictions, dtype=np.float64)
+        y = np.asarray(labels).astype(bool)
+        idx = ((p - self.lo) / (self.hi - self.lo) * self.n_bins).astype(np.int64)
+        idx = np.clip(idx, 0, self.n_bins - 1)
+        self.pos += np.bincount(idx[y], minlength=self.n_bins)
+        self.neg += np.bincount(idx[~y], minlength=self.n_bins)
+        return self
+
+    def merge(self, other: "StreamingAUC") -> "StreamingAUC":
+        if (self.n_bins, self.lo, self.hi) != (other.n_bins, other.lo, other.hi):
+            raise ValueError("Cannot merge StreamingAUC with different binning")
+        self.pos += other.pos
+        self.neg += other.neg
+        return self
+
+    def value(self) -> float:
+        n_pos = int(self.pos.sum())
+        n_neg = int(self.neg.sum())
+        if n_pos == 0 or n_neg == 0:
+            return 0.5
+        neg_below = np.cumsum(self.neg) - self.neg
+        wins = (self.pos * neg_below).sum() + 0.5 * (self.pos * self.neg).sum()
+        return float(wins / (n_pos * n_neg))
+
+
 def aggregate_results(runs: List[Dict[str, Any]]) -> Dict[str, float]:
     """Aggregate metrics across multiple runs."""
     if not runs:
@@ -43,3 +129,153 @@ def aggregate_results(runs: List[Dict[str, Any]]) -> Dict[str, float]:
             metrics[f"{key}_std"] = statistics.stdev(values) if len(values) > 1 else 0.0
     
     return metrics
+
+
+class RunningStats:
+    """Count, mean and sum of squared deviations via Welford updates (Chan merge)."""
+    __slots__ = ("count", "mean", "m2")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, x: float) -> "RunningStats":
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+        return self
+
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        if other.count == 0:
+            return self
+        n = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / n
+        self.m2 += other.m2 + delta * delta * self.count * other.count / n
+        self.count = n
+        return self
+
+    def update_batch(self, values) -> "RunningStats":
+        """Fold in a whole array at once (NumPy moments, then a Chan merge)."""
+        v = np.asarray(values, dtype=np.float64)
+        if v.size == 0:
+            return self
+        other = RunningStats()
+        other.count = int(v.size)
+        other.mean = float(v.mean())
+        other.m2 = float(((v - other.mean) ** 2).sum())
+        return self.merge(other)
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation (0.0 for fewer than two values)."""
+        return (self.m2 / (self.count - 1)) ** 0.5 if self.count > 1 else 0.0
+
+
+class RunningCorrelation:
+    """Mergeable accumulator for Pearson r over (x, y) pairs."""
+    __slots__ = ("count", "mean_x", "mean_y", "m2x", "m2y", "cxy")
+
+    def __init__(self):
+        self.count = 0
+        self.mean_x = self.mean_y = 0.0
+        self.m2x = self.m2y = self.cxy = 0.0
+
+    def update(self, x: float, y: float) -> "RunningCorrelation":
+        self.count += 1
+        dx = x - self.mean_x
+        self.mean_x += dx / self.count
+        dy = y - self.mean_y
+        self.mean_y += dy / self.count
+        self.m2x += dx * (x - self.mean_x)
+        self.m2y += dy * (y - self.mean_y)
+        self.cxy += dx * (y - self.mean_y)
+        return self
+
+    def update_batch(self, xs, ys) -> "RunningCorrelation":
+        x = np.asarray(xs, dtype=np.float64)
+        y = np.asarray(ys, dtype=np.float64)
+        if x.size == 0:
+            return self
+        other = RunningCorrelation()
+        other.count = int(x.size)
+        other.mean_x, other.mean_y = float(x.mean()), float(y.mean())
+        xc, yc = x - other.mean_x, y - other.mean_y
+        other.m2x, other.m2y, other.cxy = float(xc @ xc), float(yc @ yc), float(xc @ yc)
+        return self.merge(other)
+
+    def merge(self, other: "RunningCorrelation") -> "RunningCorrelation":
+        if other.count == 0:
+            return self
+        n = self.count + other.count
+        dx = other.mean_x - self.mean_x
+        dy = other.mean_y - self.mean_y
+        w = self.count * other.count / n
+        self.mean_x += dx * other.count / n
+        self.mean_y += dy * other.count / n
+        self.m2x += other.m2x + dx * dx * w
+        self.m2y += other.m2y + dy * dy * w
+        self.cxy += other.cxy + dx * dy * w
+        self.count = n
+        return self
+
+    @property
+    def degenerate(self) -> bool:
+        """True when r is undefined: fewer than two pairs or a side with no variance."""
+        # m2 of a constant column is rounding residue (~n * (eps * mean)**2), not spread
+        floor = 1e-24 * self.count
+        return (self.count < 2 or self.m2x <= floor * max(1.0, self.mean_x ** 2)
+                or self.m2y <= floor * max(1.0, self.mean_y ** 2))
+
+    @property
+    def r(self) -> float:
+        """Pearson r (0.0 when `degenerate`)."""
+        if self.degenerate:
+            return 0.0
+        return max(-1.0, min(1.0, self.cxy / (self.m2x * self.m2y) ** 0.5))
+
+
+class StreamingAggregator:
+    """Streaming `aggregate_results` with O(keys) memory.
+
+    Feed run dicts with `update` (e.g. straight from `utils.read_jsonl`) and
+    combine accumulators from worker processes with `merge`. Unlike
+    `aggregate_results`, keys are collected from every record, not only the
+    first.
+    """
+
+    def __init__(self):
+        self.stats: Dict[str, RunningStats] = {}
+
+    def update(self, record: Dict[str, Any]) -> "StreamingAggregator":
+        for key, value in record.items():
+            if isinstance(value, (int, float)):
+                acc = self.stats.get(key)
+                if acc is None:
+                    acc = self.stats[key] = RunningStats()
+                acc.update(value)
+        return self
+
+    def update_many(self, records: Iterable[Dict[str, Any]]) -> "StreamingAggregator":
+        for record in records:
+            self.update(record)
+        return self
+
+    def merge(self, other: "StreamingAggregator") -> "StreamingAggregator":
+        for key, acc in other.stats.items():
+            self.stats.setdefault(key, RunningStats()).merge(acc)
+        return self
+
+    def result(self) -> Dict[str, float]:
+        metrics = {}
+        for key, acc in self.stats.items():
+            metrics[f"{key}_mean"] = acc.mean
+            metrics[f"{key}_std"] = acc.std
+        return metrics
+
+
+def aggregate_jsonl(path: str) -> Dict[str, float]:
+    """`aggregate_results` over a JSONL results file without loading it."""
+    return StreamingAggregator().update_many(read_jsonl(path)).result()
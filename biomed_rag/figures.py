@@ -0,0 +1,122 @@
+"""Incremental, parallel figure builds.
+
+Each `FigureSpec` is keyed by a hash of its projected input data, extra
+input files, plotting parameters and the source of its render function.
+`build_figures` skips figures whose key matches the manifest from the last
+build (and whose outputs still exist), and renders the rest in a process
+pool. Render functions must be module-level so they can be pickled.
+"""
+import hashlib
+import inspect
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence
+
+UP_TO_DATE = "up-to-date"
+BUILT = "built"
+
+
+@dataclass
+class FigureSpec:
+    name: str
+    render: Callable[[Any], None]
+    outputs: Sequence[str] = ()
+    inputs: Callable[[Any], Any] = lambda data: data  # the part of `data` the figure reads
+    files: Sequence[str] = ()  # extra input files, hashed by content
+    params: Dict[str, Any] = field(default_factory=dict)
+
+
+def file_digest(path: str) -> str:
+    if not os.path.exists(path):
+        return "missing"
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def figure_key(spec: FigureSpec, data: Any, shared_params: Optional[Dict[str, Any]] = None) -> str:
+    try:
+        source = inspect.getsource(spec.render)
+    except (OSError, TypeError):
+        source = getattr(spec.render, "__qualname__", repr(spec.render))
+    payload = {
+        "name": spec.name,
+        "inputs": spec.inputs(data),
+        "files": {f: file_digest(f) for f in spec.files},
+        "params": spec.params,
+        "shared": shared_params or {},
+        "source": source,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def load_manifest(path: str) -> Dict[str, str]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(path: str, updates: Dict[str, str]):
+    """Merge `updates` into the manifest at `path` (atomic replace)."""
+    manifest = load_manifest(path)
+    manifest.update(updates)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def build_figures(
+    specs: Iterable[FigureSpec],
+    data: Any,
+    manifest_path: str = ".figure_manifest.json",
+    workers: int = 1,
+    force: bool = False,
+    shared_params: Optional[Dict[str, Any]] = None,
+) -> Dict[str, str]:
+    """Render the stale figures in `specs`; returns name -> `BUILT` / `UP_TO_DATE`.
+
+    The manifest records every figure that rendered successfully, even if
+    another one raised (the first error is re-raised afterwards).
+    """
+    manifest = load_manifest(manifest_path)
+    status: Dict[str, str] = {}
+    todo = []
+    for spec in specs:
+        key = figure_key(spec, data, shared_params)
+        fresh = manifest.get(spec.name) == key and all(Path(o).exists() for o in spec.outputs)
+        if fresh and not force:
+            status[spec.name] = UP_TO_DATE
+        else:
+            todo.append((spec, key))
+
+    done: Dict[str, str] = {}
+    error = None
+    try:
+        if workers > 1 and len(todo) > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, len(todo))) as pool:
+                futures = {pool.submit(spec.render, data): (spec, key) for spec, key in todo}
+                for fut in as_completed(futures):
+                    spec, key = futures[fut]
+                    if fut.exception() is not None:
+                        error = error or fut.exception()
+                        continue
+                    done[spec.name] = key
+        else:
+            for spec, key in todo:
+                spec.render(data)
+                done[spec.name] = key
+    finally:
+        if done:
+            save_manifest(manifest_path, done)
+    if error is not None:
+        raise error
+    status.update({name: BUILT for name in done})
+    return status
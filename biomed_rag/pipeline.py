@@ -0,0 +1,174 @@
+"""Cached stage-DAG runner for the analysis scripts.
+
+A `Stage` is a command with declared input and output files. Its key hashes
+the command and the content of every input (globs allowed), so a stage is
+skipped when its key matches the manifest from the last successful run and
+its outputs exist. A stage depends on the stages that produce its inputs
+(plus any explicit `deps`); stages whose dependencies are done run
+concurrently in a thread pool, each as a subprocess logging to
+``<log_dir>/<stage>.log``.
+"""
+import glob
+import hashlib
+import json
+import subprocess
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from .figures import file_digest, load_manifest, save_manifest
+
+RAN = "ran"
+SKIPPED = "up-to-date"
+FAILED = "failed"
+BLOCKED = "blocked"
+
+
+@dataclass
+class Stage:
+    name: str
+    cmd: Sequence[str]
+    inputs: Sequence[str] = ()   # files or glob patterns, hashed by content
+    outputs: Sequence[str] = ()
+    deps: Sequence[str] = ()     # extra ordering constraints by stage name
+
+
+@dataclass
+class StageResult:
+    name: str
+    status: str
+    seconds: float = 0.0
+    returncode: Optional[int] = None
+    log: str = ""
+
+
+def expand_inputs(patterns: Iterable[str]) -> List[str]:
+    """Sorted input files; a pattern matching nothing is kept (and hashes as missing)."""
+    files = set()
+    for p in patterns:
+        matches = glob.glob(p, recursive=True)
+        if matches:
+            files.update(m for m in matches if Path(m).is_file())
+        else:
+            files.add(p)
+    return sorted(files)
+
+
+def stage_key(stage: Stage) -> str:
+    payload = {"cmd": list(stage.cmd), "inputs": {f: file_digest(f) for f in expand_inputs(stage.inputs)},
+               "outputs": sorted(stage.outputs)}
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+def dependencies(stages: Sequence[Stage]) -> Dict[str, List[str]]:
+    """Upstream stage names for every stage; raises ValueError on unknown names or cycles."""
+    names = {s.name for s in stages}
+    if len(names) != len(stages):
+        raise ValueError("Duplicate stage names")
+    producer = {Path(o).as_posix(): s.name for s in stages for o in s.outputs}
+    deps: Dict[str, List[str]] = {}
+    for s in stages:
+        unknown = set(s.deps) - names
+        if unknown:
+            raise ValueError(f"Stage {s.name!r} depends on unknown stages {sorted(unknown)}")
+        up = set(s.deps)
+        for f in s.inputs:
+            p = producer.get(Path(f).as_posix())
+            if p is not None and p != s.name:
+                up.add(p)
+        deps[s.name] = sorted(up)
+
+    state: Dict[str, int] = {}  # 1 visiting, 2 done
+
+    def visit(n: str, path: List[str]):
+        if state.get(n) == 2:
+            return
+        if state.get(n) == 1:
+            raise ValueError(f"Dependency cycle: {' -> '.join(path + [n])}")
+        state[n] = 1
+        for d in deps[n]:
+            visit(d, path + [n])
+        state[n] = 2
+
+    for s in stages:
+        visit(s.name, [])
+    return deps
+
+
+def _run_stage(stage: Stage, log_dir: Path) -> StageResult:
+    log = log_dir / f"{stage.name}.log"
+    start = time.perf_counter()
+    with open(log, "w") as f:
+        rc = subprocess.call(list(stage.cmd), stdout=f, stderr=subprocess.STDOUT)
+    missing = [o for o in stage.outputs if not Path(o).exists()]
+    if rc == 0 and missing:
+        with open(log, "a") as f:
+            f.write(f"\nmissing declared outputs: {missing}\n")
+        rc = -1
+    return StageResult(stage.name, RAN if rc == 0 else FAILED, time.perf_counter() - start, rc, str(log))
+
+
+def run_pipeline(
+    stages: Sequence[Stage],
+    manifest_path: str = ".pipeline_manifest.json",
+    log_dir: str = ".pipeline_logs",
+    workers: int = 2,
+    force: bool = False,
+) -> List[StageResult]:
+    """Run stale stages in dependency order, up to `workers` at a time.
+
+    Keys are computed when a stage becomes ready, i.e. after its upstream
+    stages have rewritten their outputs. A failed stage blocks its
+    dependents but not unrelated stages. Results are in declaration order.
+    """
+    deps = dependencies(stages)
+    logs = Path(log_dir)
+    logs.mkdir(parents=True, exist_ok=True)
+    manifest = load_manifest(manifest_path)
+    results: Dict[str, StageResult] = {}
+    running = {}
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        while len(results) < len(stages):
+            progressed = False
+            for s in stages:
+                if s.name in results or any(s.name == n for n, _ in running.values()):
+                    continue
+                up = [results.get(d) for d in deps[s.name]]
+                if any(r is None for r in up):
+                    continue
+                progressed = True
+                if any(r.status in (FAILED, BLOCKED) for r in up):
+                    results[s.name] = StageResult(s.name, BLOCKED)
+                    continue
+                key = stage_key(s)
+                if not force and manifest.get(s.name) == key and all(Path(o).exists() for o in s.outputs):
+                    results[s.name] = StageResult(s.name, SKIPPED)
+                    continue
+                running[pool.submit(_run_stage, s, logs)] = (s.name, key)
+            if progressed:
+                continue  # newly settled stages may unblock others before we wait
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in done:
+                name, key = running.pop(fut)
+                results[name] = fut.result()
+                if results[name].status == RAN:
+                    save_manifest(manifest_path, {name: key})
+    return [results[s.name] for s in stages]
+
+
+def format_report(results: Sequence[StageResult], wall_seconds: Optional[float] = None) -> str:
+    width = max([len("stage")] + [len(r.name) for r in results])
+    lines = [f"{'stage':<{width}}  {'status':<10}  {'time':>8}", "-" * (width + 22)]
+    for r in results:
+        lines.append(f"{r.name:<{width}}  {r.status:<10}  {r.seconds:>7.2f}s")
+    lines.append("-" * (width + 22))
+    busy = sum(r.seconds for r in results)
+    lines.append(f"{'total (stage time)':<{width + 12}}  {busy:>7.2f}s")
+    if wall_seconds is not None:
+        lines.append(f"{'wall clock':<{width + 12}}  {wall_seconds:>7.2f}s")
+    return "\n".join(lines)
@@ -1,15 +1,9 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List, Tuple, Dict
 from collections import Counter
 
 from ..utils import det_score
-
-
-def _bm25_like(query_tokens: List[str], doc_tokens: List[str]) -> float:
-    # Simplified overlap score
-    q_counts = Counter(query_tokens)
-    overlap = sum(min(q_counts[t], doc_tokens.count(t)) for t in q_counts)
-    return overlap / (len(doc_tokens) + 1)
+from ..tracing import NULL_TRACER
 
 
 def _embed_sim(query: str, doc: str) -> float:
@@ -26,29 +20,135 @@ class RetrievedDoc:
     dense: float
 
 
+@dataclass
+class IterativeRetrieval:
+    docs: List[RetrievedDoc]
+    rounds: int
+    expansion_terms: List[str] = field(default_factory=list)
+
+
 class HybridRetriever:
-    def __init__(self, bm25_weight: float = 0.7, dense_weight: float = 0.3):
+    def __init__(self, bm25_weight: float = 0.7, dense_weight: float = 0.3, tracer=None):
         self.bm25_weight = bm25_weight
         self.dense_weight = dense_weight
+        self.tracer = tracer if tracer is not None else NULL_TRACER
         self._corpus: List[str] = []
+        self._doc_len: List[int] = []
+        # term -> [(doc_id, term frequency)], built once at indexing time
+        self._postings: Dict[str, List[Tuple[int, int]]] = {}
 
     def add_documents(self, docs: List[str]):
-        self._corpus.extend(docs)
+        for doc in docs:
+            doc_id = len(self._corpus)
+            self._corpus.append(doc)
+            tokens = doc.lower().split()
+            self._doc_len.append(len(tokens))
+            for t, tf in Counter(tokens).items():
+                self._postings.setdefault(t, []).append((doc_id, tf))
 
     def fuse(self, bm25_s: float, dense_s: float) -> float:
         return self.bm25_weight * bm25_s + self.dense_weight * dense_s
 
+    def _accumulate(self, q_counts: Dict[str, int], acc: Dict[int, int]) -> int:
+        """Add clipped term overlaps for `q_counts` into `acc`; returns postings touched."""
+        touched = 0
+        for t, qc in q_counts.items():
+            plist = self._postings.get(t, ())
+            touched += len(plist)
+            for doc_id, tf in plist:
+                acc[doc_id] = acc.get(doc_id, 0) + min(qc, tf)
+        return touched
+
+    def _lexical(self, doc_id: int, acc: Dict[int, int]) -> float:
+        # Simplified overlap score
+        return acc.get(doc_id, 0) / (self._doc_len[doc_id] + 1)
+
     def retrieve(self, query: str, k: int = 5) -> List[RetrievedDoc]:
-        q_tokens = query.lower().split()
-        scored: List[RetrievedDoc] = []
-        for i, doc in enumerate(self._corpus):
-            tokens = doc.lower().split()
-            bm25_s = _bm25_like(q_tokens, tokens)
-            dense_s = _embed_sim(query, doc)
-            fused = self.fuse(bm25_s, dense_s)
-            scored.append(RetrievedDoc(i, doc, fused, bm25_s, dense_s))
-        scored.sort(key=lambda r: r.score, reverse=True)
-        return scored[:k]
+        return self.retrieve_batch([query], k=k)[0]
+
+    def retrieve_batch(self, queries: List[str], k: int = 5) -> List[List[RetrievedDoc]]:
+        """Score several queries in one pass over the corpus.
+
+        Results are identical to calling `retrieve` for every query.
+        """
+        tracer = self.tracer
+        n_docs = len(self._corpus)
+        with tracer.span("retrieve.tokenize"):
+            q_counts = [Counter(q.lower().split()) for q in queries]
+        with tracer.span("retrieve.lexical"):
+            accs = [{} for _ in queries]
+            touched = sum(self._accumulate(qc, acc) for qc, acc in zip(q_counts, accs))
+            bm25 = [[self._lexical(i, acc) for i in range(n_docs)] for acc in accs]
+        with tracer.span("retrieve.dense"):
+            dense = [[_embed_sim(q, doc) for doc in self._corpus] for q in queries]
+        with tracer.span("retrieve.fusion"):
+            scored: List[List[RetrievedDoc]] = [
+                [RetrievedDoc(i, doc, self.fuse(b[i], d[i]), b[i], d[i]) for i, doc in enumerate(self._corpus)]
+                for b, d in zip(bm25, dense)
+            ]
+        with tracer.span("retrieve.sort"):
+            for s in scored:
+                s.sort(key=lambda r: r.score, reverse=True)
+        tracer.incr("docs_scored", n_docs * len(queries))
+        tracer.incr("postings_touched", touched)
+        return [s[:k] for s in scored]
+
+    def _expansion_terms(self, top: List[int], q_counts: Dict[str, int], n: int) -> List[str]:
+        # Terms occurring in the most top-ranked docs, first occurrence breaks ties
+        df = Counter()
+        for i in top:
+            for t in dict.fromkeys(self._corpus[i].lower().split()):
+                if t not in q_counts and len(t) > 3 and t.isalpha():
+                    df[t] += 1
+        return [t for t, _ in df.most_common(n)]
+
+    def retrieve_iterative(
+        self, query: str, k: int = 5, max_iterations: int = 3, expansion_terms: int = 3
+    ) -> IterativeRetrieval:
+        """Multi-round retrieval with pseudo-relevance feedback.
+
+        Round 1 equals `retrieve`. Each later round adds up to `expansion_terms`
+        frequent terms from the current top-k to the lexical query and only walks
+        the postings of those new terms: overlap accumulators and dense scores
+        are reused, and since scores can only grow, the new top-k is chosen from
+        the old top-k plus the touched docs. Stops early once the top-k set no
+        longer changes.
+        """
+        tracer = self.tracer
+        with tracer.span("retrieve.round"):
+            q_counts = Counter(query.lower().split())
+            acc: Dict[int, int] = {}
+            touched = self._accumulate(q_counts, acc)
+            dense = [_embed_sim(query, doc) for doc in self._corpus]
+            scores = [self.fuse(self._lexical(i, acc), d) for i, d in enumerate(dense)]
+            top = sorted(range(len(scores)), key=lambda i: (-scores[i], i))[:k]
+        tracer.incr("docs_scored", len(self._corpus))
+
+        rounds = 1
+        added: List[str] = []
+        while rounds < max_iterations:
+            new_terms = self._expansion_terms(top, q_counts, expansion_terms)
+            if not new_terms:
+                break
+            rounds += 1
+            with tracer.span("retrieve.round"):
+                delta = Counter(new_terms)
+                q_counts.update(delta)
+                added.extend(new_terms)
+                touched += self._accumulate(delta, acc)
+                changed = {doc_id for t in new_terms for doc_id, _ in self._postings[t]}
+                for i in changed:
+                    scores[i] = self.fuse(self._lexical(i, acc), dense[i])
+                new_top = sorted(set(top) | changed, key=lambda i: (-scores[i], i))[:k]
+            tracer.incr("docs_scored", len(changed))
+            stable = set(new_top) == set(top)
+            top = new_top
+            if stable:
+                break
+        tracer.incr("postings_touched", touched)
+
+        docs = [RetrievedDoc(i, self._corpus[i], scores[i], self._lexical(i, acc), dense[i]) for i in top]
+        return IterativeRetrieval(docs=docs, rounds=rounds, expansion_terms=added)
 
     def precision_at_k(self, query: str, positives: List[int], k: int = 10) -> float:
         res = self.retrieve(query, k=k)
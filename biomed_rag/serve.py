@@ -0,0 +1,202 @@
+"""Local HTTP serving layer for RAGSystem with dynamic micro-batching.
+
+Run with ``python -m biomed_rag.serve --notes data/samples/mimic_notes.json``.
+Requests that arrive within ``max_latency_ms`` of each other are grouped into
+one batched retrieval/scoring call (up to ``max_batch_size``), and identical
+in-flight requests share a single computation.
+"""
+import argparse
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Set
+
+from .core.nli import build_nli_scorer, nli_config
+from .rag_wrapper import RAGSystem
+from .tracing import Tracer
+from .utils import Config
+
+
+class MicroBatcher:
+    """Group concurrent `submit` calls into batches for `batch_fn`.
+
+    `batch_fn` receives a list of distinct keys and must return one result per
+    key, in order. It runs on a single worker thread so the event loop keeps
+    accepting requests while a batch is being computed.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[Hashable]], List[Any]],
+        max_batch_size: int = 32,
+        max_latency_ms: float = 5.0,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be >= 1")
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_latency_ms = max_latency_ms
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._pending: List[Hashable] = []
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()  # strong refs so running batches are not GC'd
+        self.stats = {"requests": 0, "coalesced": 0, "batches": 0, "batched_items": 0}
+
+    async def submit(self, key: Hashable) -> Any:
+        self.stats["requests"] += 1
+        fut = self._inflight.get(key)
+        if fut is not None:
+            self.stats["coalesced"] += 1
+            return await asyncio.shield(fut)
+
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        self._inflight[key] = fut
+        self._pending.append(key)
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_latency_ms / 1000.0, self._flush)
+        return await asyncio.shield(fut)
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._pending:
+            batch = self._pending[: self.max_batch_size]
+            self._pending = self._pending[self.max_batch_size:]
+            task = asyncio.ensure_future(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[Hashable]):
+        self.stats["batches"] += 1
+        self.stats["batched_items"] += len(batch)
+        loop = asyncio.get_running_loop()
+        try:
+            results = list(await loop.run_in_executor(self._executor, self.batch_fn, batch))
+            if len(results) != len(batch):
+                raise RuntimeError(f"batch_fn returned {len(results)} results for {len(batch)} keys")
+        except Exception as e:
+            for key in batch:
+                fut = self._inflight.pop(key)
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+        for key, res in zip(batch, results):
+            fut = self._inflight.pop(key)
+            if not fut.done():
+                fut.set_result(res)
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+
+
+def _retrieve_batch(rag: RAGSystem, keys: List[Hashable]) -> List[List[Dict[str, Any]]]:
+    # keys are (query, k); retrieve once with the largest k and slice per request
+    max_k = max(k for _, k in keys)
+    batch = rag.retriever.retrieve_batch([q for q, _ in keys], k=max_k)
+    return [[asdict(r) for r in res[:k]] for (_, k), res in zip(keys, batch)]
+
+
+def _rag_batch(rag: RAGSystem, keys: List[Hashable]) -> List[Dict[str, Any]]:
+    return [asdict(o) for o in rag.process_batch(list(keys), explain=False)]
+
+
+def create_app(rag: RAGSystem, max_batch_size: int = 32, max_latency_ms: float = 5.0):
+    """Build the FastAPI app exposing `/retrieve`, `/rag`, `/stats`, `/metrics` and `/health`.
+
+    `/metrics` serves Prometheus text when `rag` was built with a `Tracer`.
+    """
+    try:  # pragma: no cover
+        from fastapi import FastAPI  # type: ignore
+        from fastapi.responses import PlainTextResponse  # type: ignore
+        from pydantic import BaseModel  # type: ignore
+    except Exception as e:  # pragma: no cover
+        raise ImportError("fastapi required; install with `pip install fastapi uvicorn`.") from e
+
+    class RetrieveRequest(BaseModel):
+        query: str
+        k: int = 5
+
+    class RAGRequest(BaseModel):
+        query: str
+
+    retrieve_batcher = MicroBatcher(lambda keys: _retrieve_batch(rag, keys), max_batch_size, max_latency_ms)
+    rag_batcher = MicroBatcher(lambda keys: _rag_batch(rag, keys), max_batch_size, max_latency_ms)
+
+    @asynccontextmanager
+    async def lifespan(app):
+        yield
+        retrieve_batcher.close()
+        rag_batcher.close()
+
+    app = FastAPI(title="biomed_rag", lifespan=lifespan)
+
+    @app.post("/retrieve")
+    async def retrieve(req: RetrieveRequest):
+        docs = await retrieve_batcher.submit((req.query, req.k))
+        return {"query": req.query, "docs": docs}
+
+    @app.post("/rag")
+    async def run_rag(req: RAGRequest):
+        return await rag_batcher.submit(req.query)
+
+    @app.get("/stats")
+    async def stats():
+        return {"retrieve": retrieve_batcher.stats, "rag": rag_batcher.stats}
+
+    @app.get("/metrics")
+    async def metrics():
+        sink = getattr(rag.tracer, "sink", None)
+        text = sink.prometheus_text() if hasattr(sink, "prometheus_text") else ""
+        return PlainTextResponse(text)
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok", "documents": len(rag.retriever._corpus)}
+
+    return app
+
+
+def main(argv: Optional[List[str]] = None):  # pragma: no cover
+    ap = argparse.ArgumentParser(description="Serve RAGSystem over HTTP.")
+    ap.add_argument("--notes", default="data/samples/mimic_notes.json",
+                    help="JSON array of notes with a 'text' field")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8000)
+    ap.add_argument("--max-batch-size", type=int, default=32)
+    ap.add_argument("--max-latency-ms", type=float, default=5.0)
+    ap.add_argument("--trace", action="store_true", help="record per-stage latency for /metrics")
+    ap.add_argument("--config", default="config.yaml",
+                    help="retriever weights, inference.max_iterations and fact_checking NLI settings")
+    ap.add_argument("--max-iterations", type=int, default=None, help="override inference.max_iterations")
+    ap.add_argument("--nli-model", default=None, help="NLI model (default: fact_checking settings of --config)")
+    ap.add_argument("--nli-cache", default=None,
+                    help="SQLite NLI score cache ('' disables; default: fact_checking.nli_cache_path)")
+    args = ap.parse_args(argv)
+
+    try:
+        import uvicorn  # type: ignore
+    except Exception as e:
+        raise ImportError("uvicorn required; install with `pip install uvicorn`.") from e
+
+    with open(args.notes) as f:
+        notes = json.load(f)
+    tracer = Tracer() if args.trace else None
+    config = Config.load(args.config)
+    nli = build_nli_scorer(*nli_config(config, args.nli_model, args.nli_cache), tracer=tracer)
+    rag = RAGSystem.from_config([n["text"] if isinstance(n, dict) else str(n) for n in notes],
+                                config, tracer=tracer, nli_scorer=nli)
+    if args.max_iterations is not None:
+        rag.max_iterations = args.max_iterations
+    app = create_app(rag, max_batch_size=args.max_batch_size, max_latency_ms=args.max_latency_ms)
+    uvicorn.run(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
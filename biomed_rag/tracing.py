@@ -0,0 +1,155 @@
+"""Opt-in latency spans and counters for the retrieval/RAG hot path.
+
+Components take a ``tracer`` argument defaulting to `NULL_TRACER`, whose spans
+and counters are shared no-op objects, so disabled tracing costs one method
+call per stage. Pass a `Tracer` to record monotonic-clock spans into a sink.
+"""
+import math
+import threading
+import time
+from typing import Dict, List, Optional
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class NullTracer:
+    """Tracer used when instrumentation is disabled."""
+    enabled = False
+
+    def span(self, name: str) -> _NullSpan:
+        return _NULL_SPAN
+
+    def incr(self, name: str, n: int = 1):
+        pass
+
+
+NULL_TRACER = NullTracer()
+
+
+class HistogramSink:
+    """In-memory sink with log-bucketed latency histograms and counters.
+
+    Buckets grow geometrically by `growth` from `min_seconds`, so memory is
+    bounded per span name and percentile error is at most one bucket width.
+    """
+
+    def __init__(self, min_seconds: float = 1e-7, growth: float = 1.05):
+        self.min_seconds = min_seconds
+        self._log_growth = math.log(growth)
+        self.growth = growth
+        self._hists: Dict[str, Dict[int, int]] = {}
+        self._sums: Dict[str, float] = {}
+        self._counts: Dict[str, int] = {}
+        self.counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, seconds: float) -> int:
+        if seconds <= self.min_seconds:
+            return 0
+        return int(math.log(seconds / self.min_seconds) / self._log_growth) + 1
+
+    def _upper(self, bucket: int) -> float:
+        return self.min_seconds * self.growth ** bucket
+
+    def record_span(self, name: str, seconds: float):
+        b = self._bucket(seconds)
+        with self._lock:
+            hist = self._hists.setdefault(name, {})
+            hist[b] = hist.get(b, 0) + 1
+            self._sums[name] = self._sums.get(name, 0.0) + seconds
+            self._counts[name] = self._counts.get(name, 0) + 1
+
+    def record_count(self, name: str, n: int):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def quantile(self, name: str, q: float) -> float:
+        """Approximate `q`-quantile (upper bucket bound) of span `name` in seconds."""
+        with self._lock:
+            hist = dict(self._hists.get(name, {}))
+            total = self._counts.get(name, 0)
+        if total == 0:
+            return 0.0
+        rank = q * total
+        seen = 0
+        for b in sorted(hist):
+            seen += hist[b]
+            if seen >= rank:
+                return self._upper(b)
+        return self._upper(max(hist))  # pragma: no cover
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Per-span count, mean and p50/p95/p99 latency in seconds."""
+        out = {}
+        for name in sorted(self._counts):
+            n = self._counts[name]
+            out[name] = {
+                "count": n,
+                "mean": self._sums[name] / n,
+                "p50": self.quantile(name, 0.50),
+                "p95": self.quantile(name, 0.95),
+                "p99": self.quantile(name, 0.99),
+            }
+        return out
+
+    def prometheus_text(self, prefix: str = "biomed_rag") -> str:
+        """Render spans as a Prometheus summary and counters as `_total` series."""
+        lines: List[str] = []
+        metric = f"{prefix}_stage_seconds"
+        lines.append(f"# HELP {metric} Stage latency in seconds.")
+        lines.append(f"# TYPE {metric} summary")
+        for name, s in self.summary().items():
+            for q, key in (("0.5", "p50"), ("0.95", "p95"), ("0.99", "p99")):
+                lines.append(f'{metric}{{stage="{name}",quantile="{q}"}} {s[key]:.9g}')
+            lines.append(f'{metric}_sum{{stage="{name}"}} {self._sums[name]:.9g}')
+            lines.append(f'{metric}_count{{stage="{name}"}} {s["count"]}')
+        for name in sorted(self.counters):
+            c = f"{prefix}_{name}_total"
+            lines.append(f"# TYPE {c} counter")
+            lines.append(f"{c} {self.counters[name]}")
+        return "\n".join(lines) + "\n"
+
+
+class _Span:
+    __slots__ = ("_sink", "_name", "_t0")
+
+    def __init__(self, sink, name: str):
+        self._sink = sink
+        self._name = name
+
+    def __enter__(self):
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._sink.record_span(self._name, time.perf_counter() - self._t0)
+        return False
+
+
+class Tracer:
+    """Records spans and counters into a pluggable sink.
+
+    Any object with `record_span(name, seconds)` and `record_count(name, n)`
+    can be used as the sink; defaults to a fresh `HistogramSink`.
+    """
+    enabled = True
+
+    def __init__(self, sink: Optional[HistogramSink] = None):
+        self.sink = sink if sink is not None else HistogramSink()
+
+    def span(self, name: str) -> _Span:
+        return _Span(self.sink, name)
+
+    def incr(self, name: str, n: int = 1):
+        self.sink.record_count(name, n)
@@ -0,0 +1,157 @@
+"""Calibrate trust weights {C, Tr, F} against human ratings.
+
+Every candidate weighting on the simplex is evaluated at once as a
+(candidates x rows) matrix product, chunked over candidates to bound memory.
+
+    python -m biomed_rag.trust.calibrate ratings.jsonl --config config.yaml
+"""
+import argparse
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from .trust_scorer import trust_terms
+
+WEIGHT_KEYS = ("C", "Tr", "F")
+
+
+def feature_matrix(exact_match, rationale_length, fact_score) -> np.ndarray:
+    """(rows, 3) matrix of the clipped C, Tr, F terms used by `compute_trust_score`."""
+    return np.column_stack(trust_terms(exact_match, rationale_length, fact_score))
+
+
+def load_rows(path: str, rating_key: str = "human_rating") -> Tuple[np.ndarray, np.ndarray]:
+    """Load logged rows (JSON array or JSONL) into features X and ratings y."""
+    text = Path(path).read_text()
+    if path.endswith(".jsonl"):
+        rows = [json.loads(line) for line in text.splitlines() if line.strip()]
+    else:
+        rows = json.loads(text)
+    rows = [r for r in rows if r.get(rating_key) is not None]
+    if not rows:
+        raise ValueError(f"No rows with '{rating_key}' in {path}")
+    X = feature_matrix(
+        [r["exact_match"] for r in rows],
+        [r["rationale_length"] for r in rows],
+        [r["fact_score"] for r in rows],
+    )
+    y = np.asarray([r[rating_key] for r in rows], dtype=np.float64)
+    return X, y
+
+
+def simplex_grid(step: float = 0.05) -> np.ndarray:
+    """All (w_C, w_Tr, w_F) with non-negative multiples of `step` summing to 1."""
+    n = int(round(1.0 / step))
+    i, j = np.meshgrid(np.arange(n + 1), np.arange(n + 1), indexing="ij")
+    mask = i + j <= n
+    i, j = i[mask], j[mask]
+    return np.column_stack([i, j, n - i - j]) / n
+
+
+def candidate_losses(W: np.ndarray, X: np.ndarray, y: np.ndarray, objective: str = "mse") -> np.ndarray:
+    """Loss of every candidate weighting (row of `W`); lower is better.
+
+    ``mse`` compares the 0-5 trust score to the ratings, ``pearson`` uses the
+    negated correlation (scale-free).
+    """
+    T = np.clip(5.0 * (W @ X.T), 0.0, 5.0)  # candidates x rows
+    if objective == "mse":
+        return np.mean((T - y) ** 2, axis=1)
+    if objective == "pearson":
+        Tc = T - T.mean(axis=1, keepdims=True)
+        yc = y - y.mean()
+        denom = np.sqrt((Tc ** 2).sum(axis=1) * (yc ** 2).sum())
+        with np.errstate(invalid="ignore", divide="ignore"):
+            r = np.where(denom > 0, (Tc @ yc) / denom, 0.0)
+        return -r
+    raise ValueError(f"Unknown objective: {objective}")
+
+
+def calibrate(
+    X: np.ndarray,
+    y: np.ndarray,
+    step: float = 0.05,
+    objective: str = "mse",
+    n_random: int = 0,
+    rng: Optional[np.random.Generator] = None,
+    max_cells: int = 20_000_000,
+) -> Tuple[Dict[str, float], float]:
+    """Search the weight simplex; returns the best weights and their loss.
+
+    Candidates are the `simplex_grid(step)` plus `n_random` Dirichlet draws.
+    At most `max_cells` candidate x row scores are materialised at a time.
+    """
+    W = simplex_grid(step)
+    if n_random:
+        rng = rng if rng is not None else np.random.default_rng(0)
+        W = np.vstack([W, rng.dirichlet(np.ones(3), size=n_random)])
+    chunk = max(1, max_cells // max(1, len(y)))
+    losses = np.concatenate([candidate_losses(W[i:i + chunk], X, y, objective) for i in range(0, len(W), chunk)])
+    best = int(np.argmin(losses))
+    return dict(zip(WEIGHT_KEYS, (float(w) for w in W[best]))), float(losses[best])
+
+
+def _weights_block(weights: Dict[str, float], indent: str, ndigits: int) -> str:
+    return f"{indent}weights:\n" + "".join(f"{indent}  {k}: {round(v, ndigits)}\n" for k, v in weights.items())
+
+
+def write_weights(config_path: str, weights: Dict[str, float], out_path: Optional[str] = None, ndigits: int = 4):
+    """Replace the `trust.weights` block of the YAML config at `config_path`.
+
+    Only that block is rewritten; every other line, comments and key order
+    included, is kept verbatim. Written atomically to `out_path` (default:
+    `config_path`).
+    """
+    lines = Path(config_path).read_text().splitlines(keepends=True)
+    trust = next((i for i, l in enumerate(lines) if re.match(r"trust:\s*(#.*)?$", l)), None)
+    if trust is None:
+        if lines and not lines[-1].endswith("\n"):
+            lines[-1] += "\n"
+        lines += ["\n", "trust:\n", _weights_block(weights, "  ", ndigits)]
+    else:
+        end = trust + 1
+        while end < len(lines) and (not lines[end].strip() or lines[end][0] in " \t"):
+            end += 1
+        start = next((i for i in range(trust + 1, end) if re.match(r"\s+weights:\s*(#.*)?$", lines[i])), None)
+        if start is None:
+            lines.insert(trust + 1, _weights_block(weights, "  ", ndigits))
+        else:
+            indent = lines[start][:len(lines[start]) - len(lines[start].lstrip())]
+            stop = start + 1
+            while stop < end and (not lines[stop].strip() or lines[stop].startswith(indent + " ")):
+                stop += 1
+            while stop > start + 1 and not lines[stop - 1].strip():  # keep blank lines after the block
+                stop -= 1
+            lines[start:stop] = [_weights_block(weights, indent, ndigits)]
+    out = out_path or config_path
+    tmp = f"{out}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        f.writelines(lines)
+    os.replace(tmp, out)
+
+
+def main(argv=None):  # pragma: no cover
+    ap = argparse.ArgumentParser(description="Calibrate trust weights against human ratings.")
+    ap.add_argument("rows", help="JSON/JSONL with exact_match, rationale_length, fact_score and a rating")
+    ap.add_argument("--rating-key", default="human_rating")
+    ap.add_argument("--config", default="config.yaml")
+    ap.add_argument("--out", default=None, help="output config path (default: update the weights block of --config in place)")
+    ap.add_argument("--step", type=float, default=0.01)
+    ap.add_argument("--objective", choices=["mse", "pearson"], default="mse")
+    ap.add_argument("--n-random", type=int, default=0)
+    ap.add_argument("--seed", type=int, default=42)
+    args = ap.parse_args(argv)
+
+    X, y = load_rows(args.rows, args.rating_key)
+    weights, loss = calibrate(X, y, step=args.step, objective=args.objective,
+                              n_random=args.n_random, rng=np.random.default_rng(args.seed))
+    write_weights(args.config, weights, args.out)
+    print(f"✅ Best weights {weights} ({args.objective}={loss:.4f}, n={len(y)}) → {args.out or args.config}")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -1,4 +1,8 @@
-from typing import Dict
+from typing import Dict, Tuple
+
+import numpy as np
+
+DEFAULT_WEIGHTS: Dict[str, float] = {"C": 0.4, "Tr": 0.3, "F": 0.3}
 
 
 def compute_trust_score(
@@ -14,7 +18,7 @@ def compute_trust_score(
     Default weights: {C: 0.4, Tr: 0.3, F: 0.3}
     """
     if weights is None:
-        weights = {"C": 0.4, "Tr": 0.3, "F": 0.3}
+        weights = DEFAULT_WEIGHTS
     
     C = max(0.0, min(1.0, exact_match))
     Tr = min(1.0, rationale_length / 10.0)
@@ -22,3 +26,33 @@ def compute_trust_score(
     
     T = weights["C"] * C + weights["Tr"] * Tr + weights["F"] * F
     return max(0.0, min(5.0, T * 5.0))  # scale to 1-5
+
+
+def trust_terms(exact_match, rationale_length, fact_score) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Clipped (C, Tr, F) columns of `compute_trust_score`.
+
+    fmin/fmax mirror the builtin min/max chain, which maps NaN to the
+    upper bound (np.clip would propagate it).
+    """
+    C = np.fmax(0.0, np.fmin(1.0, np.asarray(exact_match, dtype=np.float64)))
+    Tr = np.fmin(1.0, np.asarray(rationale_length, dtype=np.float64) / 10.0)
+    F = np.fmax(0.0, np.fmin(1.0, np.asarray(fact_score, dtype=np.float64)))
+    return C, Tr, F
+
+
+def compute_trust_score_batch(
+    exact_match,
+    rationale_length,
+    fact_score,
+    weights: Dict[str, float] = None
+) -> np.ndarray:
+    """
+    Vectorized `compute_trust_score` over NumPy columns (or anything
+    broadcastable); element-wise identical to the scalar version.
+    """
+    if weights is None:
+        weights = DEFAULT_WEIGHTS
+
+    C, Tr, F = trust_terms(exact_match, rationale_length, fact_score)
+    T = weights["C"] * C + weights["Tr"] * Tr + weights["F"] * F
+    return np.fmax(0.0, np.fmin(5.0, T * 5.0))
@@ -2,8 +2,12 @@ import hashlib
 import json
 import os
 import random
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from dataclasses import dataclass
-from typing import Any, Dict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .deid import DEFAULT_ENGINE
 
 # Optional heavy deps (numpy, yaml) are guarded to keep tests lightweight.
 try:  # pragma: no cover
@@ -50,6 +54,23 @@ def set_seed(seed: int = 42):
         pass
 
 
+def query_rng(seed: int, index: int):
+    """Independent `numpy.random.Generator` for item `index` of a run seeded with `seed`.
+
+    Equivalent to ``SeedSequence(seed).spawn(index + 1)[index]`` without
+    materialising the siblings, so each query draws the same numbers no
+    matter which worker runs it or in what order.
+    """
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(index,)))
+
+
+def ensure_rng(rng=None):
+    """Return `rng`, or a Generator seeded from the global numpy state (honours `set_seed`)."""
+    if rng is not None:
+        return rng
+    return np.random.default_rng(np.random.randint(0, 2**31 - 1))
+
+
 def fair_doi() -> str:
     return "10.5281/zenodo.1234567"
 
@@ -60,11 +81,17 @@ def det_score(*args: str) -> float:
     return int(h[:8], 16) / 0xFFFFFFFF
 
 
-def privacy_guard(text: str, enable: bool = True) -> str:
-    """Very simple placeholder de-identification (for samples only)."""
+def privacy_guard(text: str, enable: bool = True, engine=None) -> str:
+    """De-identify `text` with `engine` (default: `deid.DEFAULT_ENGINE`)."""
     if not enable:
         return text
-    return text.replace("Patient", "P.").replace("Name", "N.")
+    return (engine or DEFAULT_ENGINE).scrub(text)
+
+
+def privacy_guard_batch(texts: List[str], enable: bool = True, engine=None) -> List[str]:
+    if not enable:
+        return list(texts)
+    return (engine or DEFAULT_ENGINE).scrub_batch(texts)
 
 
 def read_jsonl(path: str):
@@ -74,6 +101,128 @@ def read_jsonl(path: str):
                 yield json.loads(line)
 
 
+def jsonl_byte_ranges(path: str, chunk_bytes: int = 8 << 20) -> List[Tuple[int, int]]:
+    """Split `path` into [start, end) byte ranges of ~chunk_bytes that end on a newline."""
+    size = os.path.getsize(path)
+    ranges = []
+    with open(path, "rb") as f:
+        start = 0
+        while start < size:
+            f.seek(min(size, start + chunk_bytes))
+            f.readline()
+            end = min(size, f.tell())
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def _parse_jsonl_range(path: str, start: int, end: int, transform: Optional[Callable]) -> List[Any]:
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    records = [json.loads(line) for line in data.splitlines() if line.strip()]
+    return transform(records) if transform is not None else records
+
+
+def read_jsonl_parallel(
+    path: str,
+    transform: Optional[Callable[[List[Any]], List[Any]]] = None,
+    workers: Optional[int] = None,
+    chunk_bytes: int = 8 << 20,
+    ordered: bool = True,
+    prefetch: Optional[int] = None,
+):
+    """Parse a JSONL file in newline-aligned byte-range chunks across processes.
+
+    `transform` (a picklable function over a list of records, e.g. de-id)
+    runs inside the workers. At most `prefetch` chunks (default 2 x workers)
+    are parsed ahead of the consumer, bounding memory. With ``ordered=False``
+    chunks are yielded as soon as they finish. ``workers <= 1`` parses in
+    process; ``None`` uses one worker per CPU, never more than there are chunks.
+    """
+    ranges = jsonl_byte_ranges(path, chunk_bytes)
+    if workers is None:
+        workers = min(os.cpu_count() or 1, len(ranges))
+    if workers <= 1:
+        for start, end in ranges:
+            yield from _parse_jsonl_range(path, start, end, transform)
+        return
+    prefetch = max(1, prefetch or 2 * workers)
+    todo = deque(ranges)
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        inflight = deque()
+        while todo or inflight:
+            while todo and len(inflight) < prefetch:
+                start, end = todo.popleft()
+                inflight.append(pool.submit(_parse_jsonl_range, path, start, end, transform))
+            if ordered:
+                yield from inflight.popleft().result()
+            else:
+                done, _ = wait(inflight, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    inflight.remove(fut)
+                    yield from fut.result()
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def iter_json_array(path: str, chunk_size: int = 1 << 16):
+    """Yield the elements of a top-level JSON array one at a time.
+
+    Reads `path` in buffered chunks and decodes each element with
+    `json.JSONDecoder.raw_decode`, so memory is bounded by the largest element
+    and a consumer that stops early never reads the rest of the file.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, "r") as f:
+        buf, pos, eof = "", 0, False
+        read_size = chunk_size
+        state = 0  # 0: expect '[', 1: value or ']', 2: ',' or ']', 3: value
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n":
+                pos += 1
+            if pos == len(buf):
+                if eof:
+                    raise ValueError(f"Unexpected end of JSON array in {path}")
+                chunk = f.read(read_size)
+                eof = not chunk
+                buf, pos = buf[pos:] + chunk, 0
+                continue
+            c = buf[pos]
+            if state == 0:
+                if c != "[":
+                    raise ValueError(f"Expected a JSON array in {path}")
+                pos, state = pos + 1, 1
+                continue
+            if c == "]" and state in (1, 2):
+                return
+            if state == 2:
+                if c != ",":
+                    raise ValueError(f"Expected ',' or ']' at offset {pos} of buffer in {path}")
+                pos, state = pos + 1, 3
+                continue
+            try:
+                obj, end = decoder.raw_decode(buf, pos)
+                complete = end < len(buf) or eof
+                if complete and not eof and isinstance(obj, (int, float)) and not isinstance(obj, bool):
+                    # a number cut after e.g. "10." or "1e" decodes as its prefix: only trust it
+                    # once the next character ends it
+                    complete = buf[end] in ",] \t\r\n"
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                complete = False
+            if not complete:
+                chunk = f.read(read_size)
+                eof = not chunk
+                buf, pos = buf[pos:] + chunk, 0
+                read_size *= 2  # element larger than the buffer: grow geometrically
+                continue
+            yield obj
+            pos, state, read_size = end, 2, chunk_size
+
+
 def write_json(path: str, obj: Any):
     os.makedirs(os.path.dirname(path), exist_ok=True)
     with open(path, "w") as f:
@@ -2,12 +2,28 @@
 """
 Generate realistic synthetic MIMIC-III-like data for reproducible testing.
 Creates 100+ clinical notes with associated diagnoses and metadata.
+
+For load testing, ``--stream`` writes millions of notes to sharded (optionally
+gzipped) JSONL files from a process pool instead:
+
+    python generate_dummy_mimic.py --stream --n-records 10000000 --shards 64 \
+        --workers 16 --gzip --vocab-size 50000 --mean-length 120
 """
+import argparse
+import gzip
+import io
 import json
+import os
 import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
 
+import numpy as np
+
+from biomed_rag.utils import query_rng
+
 # Set seed for reproducibility
 random.seed(42)
 
@@ -124,7 +140,157 @@ def generate_mimic_data(n_records: int = 100) -> tuple:
     return notes, diagnoses
 
 
-def main():
+@dataclass
+class StreamConfig:
+    """Everything that determines the streamed corpus; shard k depends only on this and k."""
+    n_records: int = 1_000_000
+    shards: int = 16
+    seed: int = 42
+    vocab_size: int = 5000
+    zipf_a: float = 1.1           # token frequency ~ 1 / rank**zipf_a
+    length_dist: str = "lognormal"  # or "poisson"
+    mean_length: float = 60.0
+    length_sigma: float = 0.5     # lognormal shape
+    min_length: int = 5
+    compress: bool = False
+    batch_size: int = 10000
+
+
+def stream_vocabulary(vocab_size: int) -> np.ndarray:
+    """Clinical words first (most frequent under Zipf), padded with synthetic terms."""
+    words = []
+    for phrase in SYMPTOMS + FINDINGS + TREATMENTS + list(ICD9_CODES.values()):
+        words.extend(w.strip(",").lower() for w in phrase.split())
+    words = list(dict.fromkeys(words))[:vocab_size]
+    words += [f"term{i}" for i in range(vocab_size - len(words))]
+    return np.array(words, dtype=object)
+
+
+def shard_bounds(n_records: int, shards: int, k: int) -> tuple:
+    return k * n_records // shards, (k + 1) * n_records // shards
+
+
+def shard_paths(out_dir: Path, k: int, cfg: StreamConfig) -> tuple:
+    ext = ".jsonl.gz" if cfg.compress else ".jsonl"
+    tag = f"{k:05d}-of-{cfg.shards:05d}{ext}"
+    return out_dir / f"mimic_notes-{tag}", out_dir / f"mimic_diagnoses-{tag}"
+
+
+def _note_lengths(rng, n: int, cfg: StreamConfig) -> np.ndarray:
+    if cfg.length_dist == "poisson":
+        lengths = rng.poisson(cfg.mean_length, n)
+    elif cfg.length_dist == "lognormal":
+        mu = np.log(cfg.mean_length) - cfg.length_sigma ** 2 / 2  # so that E[length] = mean_length
+        lengths = np.rint(rng.lognormal(mu, cfg.length_sigma, n))
+    else:
+        raise ValueError(f"Unknown length distribution: {cfg.length_dist}")
+    return np.maximum(cfg.min_length, lengths).astype(np.int64)
+
+
+def _open_gzip(path: Path):
+    # mtime=0 keeps the gzip header, and so the shard bytes, reproducible
+    return io.TextIOWrapper(gzip.GzipFile(path, "wb", compresslevel=6, mtime=0), encoding="utf-8")
+
+
+def write_shard(k: int, cfg: StreamConfig, out_dir: str) -> dict:
+    """Generate shard `k` batch by batch and stream it to disk; returns its counts."""
+    rng = query_rng(cfg.seed, k)
+    words = stream_vocabulary(cfg.vocab_size)
+    cdf = np.cumsum(1.0 / np.arange(1, cfg.vocab_size + 1) ** cfg.zipf_a)
+    cdf /= cdf[-1]
+    codes = np.array(list(ICD9_CODES))
+    titles = np.array(list(ICD9_CODES.values()))
+    base = np.datetime64("2020-01-01")
+    start, end = shard_bounds(cfg.n_records, cfg.shards, k)
+    notes_path, dx_path = shard_paths(Path(out_dir), k, cfg)
+    opener = _open_gzip if cfg.compress else (lambda p: open(p, "w"))
+    n_dx_total = 0
+    with opener(notes_path) as nf, opener(dx_path) as df:
+        for lo in range(start, end, cfg.batch_size):
+            rows = np.arange(lo, min(end, lo + cfg.batch_size))
+            n = len(rows)
+            lengths = _note_lengths(rng, n, cfg)
+            token_ids = np.searchsorted(cdf, rng.random(int(lengths.sum())), side="right")
+            tokens = words[np.minimum(token_ids, cfg.vocab_size - 1)].tolist()
+            dates = (base + rng.integers(0, 366, n)).astype(str).tolist()
+            cats = rng.integers(0, len(CATEGORIES), n).tolist()
+            n_dx = rng.integers(1, 4, n)
+            picks = np.argsort(rng.random((n, len(codes))), axis=1)[:, :3]
+            note_lines = []
+            dx_lines = []
+            pos = 0
+            for j, row in enumerate(rows.tolist()):
+                ln = int(lengths[j])
+                note_lines.append(json.dumps({
+                    "subject_id": 10000 + row,
+                    "hadm_id": 20000 + row,
+                    "chartdate": dates[j],
+                    "category": CATEGORIES[cats[j]],
+                    "text": " ".join(tokens[pos:pos + ln]),
+                    "row_id": row,
+                }))
+                pos += ln
+                for seq, c in enumerate(picks[j, :n_dx[j]].tolist(), 1):
+                    dx_lines.append(json.dumps({
+                        "subject_id": 10000 + row,
+                        "hadm_id": 20000 + row,
+                        "icd9_code": str(codes[c]),
+                        "short_title": str(titles[c]),
+                        "seq_num": seq,
+                    }))
+            nf.write("\n".join(note_lines) + "\n")
+            df.write("\n".join(dx_lines) + "\n")
+            n_dx_total += len(dx_lines)
+    return {"shard": k, "notes": end - start, "diagnoses": n_dx_total,
+            "notes_path": notes_path.name, "diagnoses_path": dx_path.name}
+
+
+def generate_stream(cfg: StreamConfig, out_dir: str, workers: int = 1) -> dict:
+    """Write all shards (in parallel when `workers` > 1) plus a manifest.json."""
+    Path(out_dir).mkdir(parents=True, exist_ok=True)
+    if cfg.n_records < 0 or cfg.shards < 1:
+        raise ValueError("n_records must be >= 0 and shards >= 1")
+    ks = range(cfg.shards)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            shards = list(pool.map(write_shard, ks, [cfg] * cfg.shards, [out_dir] * cfg.shards))
+    else:
+        shards = [write_shard(k, cfg, out_dir) for k in ks]
+    manifest = {"config": asdict(cfg), "shards": shards,
+                "notes": sum(s["notes"] for s in shards),
+                "diagnoses": sum(s["diagnoses"] for s in shards)}
+    with open(Path(out_dir) / "manifest.json", "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Generate synthetic MIMIC-III-like notes and diagnoses.")
+    ap.add_argument("--stream", action="store_true", help="write sharded JSONL for load testing")
+    ap.add_argument("--out-dir", default="data/samples/stream")
+    ap.add_argument("--n-records", type=int, default=StreamConfig.n_records)
+    ap.add_argument("--shards", type=int, default=StreamConfig.shards)
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--seed", type=int, default=StreamConfig.seed)
+    ap.add_argument("--vocab-size", type=int, default=StreamConfig.vocab_size)
+    ap.add_argument("--zipf-a", type=float, default=StreamConfig.zipf_a)
+    ap.add_argument("--length-dist", choices=["lognormal", "poisson"], default=StreamConfig.length_dist)
+    ap.add_argument("--mean-length", type=float, default=StreamConfig.mean_length)
+    ap.add_argument("--length-sigma", type=float, default=StreamConfig.length_sigma)
+    ap.add_argument("--gzip", action="store_true")
+    args = ap.parse_args(argv)
+
+    if args.stream:
+        cfg = StreamConfig(n_records=args.n_records, shards=args.shards, seed=args.seed,
+                           vocab_size=args.vocab_size, zipf_a=args.zipf_a, length_dist=args.length_dist,
+                           mean_length=args.mean_length, length_sigma=args.length_sigma, compress=args.gzip)
+        print(f"🏥 Streaming {cfg.n_records} synthetic notes into {cfg.shards} shards...")
+        manifest = generate_stream(cfg, args.out_dir, workers=args.workers)
+        print(f"✅ Generated {manifest['notes']} clinical notes")
+        print(f"✅ Generated {manifest['diagnoses']} diagnosis records")
+        print(f"📁 Saved to {args.out_dir} (see manifest.json)")
+        return
+
     print("🏥 Generating synthetic MIMIC-III-like data...")
     
     # Create data directory
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Load-test a running `python -m biomed_rag.serve` instance on localhost.
+Fires concurrent requests and reports throughput, latency percentiles and
+the server-side batching/coalescing counters from /stats.
+"""
+import argparse
+import json
+import random
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+QUERIES = [
+    "Does immunosuppression increase risk of myocardial infarction?",
+    "What are sepsis risk factors in elderly patients?",
+    "Is troponin elevation diagnostic of myocardial infarction?",
+    "Recommend discharge plan for stable cardiac patient.",
+    "Chest X-ray shows infiltrate and fever",
+    "Elevated creatinine with edema and dyspnea",
+]
+
+
+def _post(url: str, payload: dict) -> float:
+    body = json.dumps(payload).encode()
+    req = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"})
+    t0 = time.perf_counter()
+    with urllib.request.urlopen(req) as resp:
+        resp.read()
+    return time.perf_counter() - t0
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--url", default="http://127.0.0.1:8000")
+    ap.add_argument("--endpoint", choices=["retrieve", "rag"], default="retrieve")
+    ap.add_argument("--requests", type=int, default=500)
+    ap.add_argument("--concurrency", type=int, default=32)
+    ap.add_argument("--unique", type=float, default=0.5,
+                    help="fraction of requests with a unique query (rest repeat QUERIES)")
+    ap.add_argument("--seed", type=int, default=42)
+    args = ap.parse_args()
+
+    rng = random.Random(args.seed)
+    payloads = []
+    for i in range(args.requests):
+        q = rng.choice(QUERIES)
+        if rng.random() < args.unique:
+            q = f"{q} #{i}"
+        payloads.append({"query": q})
+
+    url = f"{args.url}/{args.endpoint}"
+    print(f"🚀 {args.requests} requests → {url} (concurrency={args.concurrency})")
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        latencies = np.array(list(pool.map(lambda p: _post(url, p), payloads))) * 1000.0
+    elapsed = time.perf_counter() - t0
+
+    print(f"   Throughput: {args.requests / elapsed:.1f} req/s")
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    print(f"   Latency ms: p50={p50:.1f}  p95={p95:.1f}  p99={p99:.1f}  max={latencies.max():.1f}")
+    with urllib.request.urlopen(f"{args.url}/stats") as resp:
+        stats = json.loads(resp.read())[args.endpoint]
+    mean_batch = stats["batched_items"] / max(1, stats["batches"])
+    print(f"   Batches: {stats['batches']}  mean size: {mean_batch:.1f}  coalesced: {stats['coalesced']}")
+
+
+if __name__ == "__main__":
+    main()
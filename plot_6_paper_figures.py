@@ -10,7 +10,9 @@ Figures:
 5. Trust Score Distribution (violin plot)
 6. Retrieval Precision@K Line Plot (k=1,3,5,10,20)
 """
+import argparse
 import json
+import os
 from pathlib import Path
 
 import numpy as np
@@ -18,9 +20,11 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from scipy import stats
 
+from biomed_rag.figures import FigureSpec, build_figures
+
 # IEEE-style plot parameters
-plt.style.use('seaborn-v0_8-whitegrid')
-plt.rcParams.update({
+STYLE = 'seaborn-v0_8-whitegrid'
+RC_PARAMS = {
     'font.size': 10,
     'axes.labelsize': 10,
     'axes.titlesize': 11,
@@ -30,7 +34,9 @@ plt.rcParams.update({
     'figure.titlesize': 12,
     'font.family': 'serif',
     'font.serif': ['Times New Roman', 'DejaVu Serif'],
-})
+}
+plt.style.use(STYLE)
+plt.rcParams.update(RC_PARAMS)
 
 
 def load_results() -> list:
@@ -294,7 +300,33 @@ def plot_fig6_precision_at_k(results: list):
 # ============================================================================
 # MAIN
 # ============================================================================
-def main():
+def figure_specs() -> list:
+    """The six figures with the slice of the results each one depends on."""
+    heatmap_exists = Path("heatmap_0.png").exists()
+    return [
+        FigureSpec("fig1_trust_vs_fact", plot_fig1_trust_vs_fact, ["fig1_trust_vs_fact.pdf"],
+                   inputs=lambda rs: [(r['fact_score'], r['trust']) for r in rs]),
+        FigureSpec("fig2_auc_comparison", plot_fig2_auc_comparison, ["fig2_auc_comparison.pdf"],
+                   inputs=lambda rs: None),
+        FigureSpec("fig3_rouge_per_query", plot_fig3_rouge_per_query, ["fig3_rouge_per_query.pdf"],
+                   inputs=lambda rs: [(r['query'], r['fact_score']) for r in rs]),
+        # reuses heatmap_0.png from the RAG run when present instead of drawing its own
+        FigureSpec("fig4_lig_heatmap", plot_fig4_lig_heatmap, [] if heatmap_exists else ["fig4_lig_heatmap.png"],
+                   inputs=lambda rs: None, files=["heatmap_0.png"]),
+        FigureSpec("fig5_trust_distribution", plot_fig5_trust_distribution, ["fig5_trust_distribution.pdf"],
+                   inputs=lambda rs: [r['trust'] for r in rs]),
+        FigureSpec("fig6_precision_at_k", plot_fig6_precision_at_k, ["fig6_precision_at_k.pdf"],
+                   inputs=lambda rs: None),
+    ]
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Generate the 6 IEEE figures (only those whose inputs changed).")
+    ap.add_argument("--workers", type=int, default=min(6, os.cpu_count() or 1))
+    ap.add_argument("--force", action="store_true", help="redraw every figure")
+    ap.add_argument("--manifest", default=".figure_manifest.json")
+    args = ap.parse_args(argv)
+
     print("=" * 70)
     print("  Generating 6 IEEE-Style Publication Figures")
     print("  Paper: \"Explainable Biomedical RAG Systems\" (IEEE 2025)")
@@ -313,12 +345,11 @@ def main():
     print("🎨 Creating figures...")
     print()
     
-    plot_fig1_trust_vs_fact(results)
-    plot_fig2_auc_comparison(results)
-    plot_fig3_rouge_per_query(results)
-    plot_fig4_lig_heatmap(results)
-    plot_fig5_trust_distribution(results)
-    plot_fig6_precision_at_k(results)
+    status = build_figures(figure_specs(), results, manifest_path=args.manifest, workers=args.workers,
+                           force=args.force, shared_params={"style": STYLE, "rc": RC_PARAMS})
+    for name, state in status.items():
+        if state != "built":
+            print(f"⏭️  {name}: {state}")
     
     print()
     print("=" * 70)
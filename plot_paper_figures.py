@@ -3,7 +3,9 @@
 Generate all 4 publication-ready figures for IEEE 2025 paper.
 Figures match the paper specification with proper styling.
 """
+import argparse
 import json
+import os
 from pathlib import Path
 
 import numpy as np
@@ -11,9 +13,11 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from scipy import stats
 
+from biomed_rag.figures import FigureSpec, build_figures
+
 # Set IEEE-style plot parameters
-plt.style.use('seaborn-v0_8-whitegrid')
-plt.rcParams.update({
+STYLE = 'seaborn-v0_8-whitegrid'
+RC_PARAMS = {
     'font.size': 10,
     'axes.labelsize': 10,
     'axes.titlesize': 11,
@@ -23,7 +27,9 @@ plt.rcParams.update({
     'figure.titlesize': 12,
     'font.family': 'serif',
     'font.serif': ['Times New Roman', 'DejaVu Serif'],
-})
+}
+plt.style.use(STYLE)
+plt.rcParams.update(RC_PARAMS)
 
 
 def load_results() -> list:
@@ -140,7 +146,23 @@ def copy_heatmap():
         print("⚠️  Run run_rag_on_dummy.py first to generate heatmaps")
 
 
-def main():
+def figure_specs() -> list:
+    return [
+        FigureSpec("fig_trust_vs_fact", plot_trust_vs_fact, ["fig_trust_vs_fact.pdf"],
+                   inputs=lambda rs: [(r['fact_score'], r['trust']) for r in rs]),
+        FigureSpec("fig_auc_bar", plot_auc_bar, ["fig_auc_bar.pdf"], inputs=lambda rs: None),
+        FigureSpec("fig_rouge_per_query", plot_rouge_per_query, ["fig_rouge_per_query.pdf"],
+                   inputs=lambda rs: [(r['query'], r['fact_score']) for r in rs]),
+    ]
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Generate the publication figures (only those whose inputs changed).")
+    ap.add_argument("--workers", type=int, default=min(3, os.cpu_count() or 1))
+    ap.add_argument("--force", action="store_true", help="redraw every figure")
+    ap.add_argument("--manifest", default=".figure_manifest.json")
+    args = ap.parse_args(argv)
+
     print("📊 Generating Publication-Ready Figures...\n")
     print("=" * 60)
     
@@ -150,9 +172,11 @@ def main():
     
     # Generate all figures
     print("🎨 Creating figures...")
-    plot_trust_vs_fact(results)
-    plot_auc_bar(results)
-    plot_rouge_per_query(results)
+    status = build_figures(figure_specs(), results, manifest_path=args.manifest, workers=args.workers,
+                           force=args.force, shared_params={"style": STYLE, "rc": RC_PARAMS})
+    for name, state in status.items():
+        if state != "built":
+            print(f"⏭️  {name}: {state}")
     copy_heatmap()
     
     print("\n" + "=" * 60)
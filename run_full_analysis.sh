@@ -6,24 +6,11 @@ echo "  Biomedical RAG — Full Analysis Pipeline (IEEE 2025)"
 echo "═══════════════════════════════════════════════════════════"
 echo ""
 
-# Step 1: Generate synthetic MIMIC-III data
-echo "📋 Step 1/4: Generating synthetic MIMIC-III data..."
-python generate_dummy_mimic.py
-echo ""
-
-# Step 2: Run full RAG pipeline
-echo "🚀 Step 2/4: Running RAG pipeline on dummy data..."
-python run_rag_on_dummy.py
-echo ""
-
-# Step 3: Generate 6 IEEE publication figures
-echo "📊 Step 3/4: Generating 6 IEEE publication figures..."
-python plot_6_paper_figures.py
-echo ""
-
-echo "📊 (Python) Generating statistical summary and LaTeX table..."
-python generate_summary.py
-
+# Stages: synthetic data → RAG pipeline → figures + summary (concurrent).
+# Stages whose inputs are unchanged since the last run are skipped;
+# pass --force to re-run everything.
+echo "📋 Running analysis stages (up-to-date stages are skipped)..."
+python run_analysis.py "$@"
 echo ""
 echo "═══════════════════════════════════════════════════════════"
 echo "✅ DONE! All results generated successfully."
@@ -0,0 +1,96 @@
+import json
+from pathlib import Path
+
+from biomed_rag.eval.benchmark import completed_ids, load_items, run_benchmark
+
+
+def _records(path: Path):
+    return sorted((json.loads(l) for l in path.read_text().splitlines()), key=lambda r: r["id"])
+
+
+def test_load_items_from_synthetic_datasets(tmp_path: Path):
+    items = load_items(str(tmp_path))
+    assert {it["dataset"] for it in items} == {"medqa", "pubmedqa", "factcc"}
+    assert [it["index"] for it in items] == list(range(len(items)))
+
+
+def test_load_items_uses_every_record_unless_capped(tmp_path: Path):
+    samples = tmp_path / "data" / "samples"
+    samples.mkdir(parents=True)
+    recs = [{"question": f"q{i}", "options": ["a", "b"], "answer": 0} for i in range(120)]
+    (samples / "medqa.json").write_text(json.dumps(recs))
+    assert len(load_items(str(tmp_path), datasets=["medqa"])) == 120  # more than load_medqa's default of 50
+    capped = load_items(str(tmp_path), datasets=["medqa"], max_items=7)
+    assert [it["query"] for it in capped] == [f"q{i}" for i in range(7)]
+
+
+def test_parallel_matches_sequential(tmp_path: Path):
+    seq, par = tmp_path / "seq.jsonl", tmp_path / "par.jsonl"
+    summary = run_benchmark(str(tmp_path), str(seq), workers=1, chunk_size=2)
+    run_benchmark(str(tmp_path), str(par), workers=2, chunk_size=1)
+    assert _records(seq) == _records(par)
+    assert summary["by_dataset"]["medqa"]["n"] == 2
+    assert set(summary["by_specialty"]) == {"cardiology", "neurology", "other"}
+    assert "trust_mean" in summary["by_specialty"]["cardiology"]
+
+
+def test_resume_skips_completed_and_repairs_partial_line(tmp_path: Path):
+    full = tmp_path / "full.jsonl"
+    run_benchmark(str(tmp_path), str(full), workers=1)
+    lines = full.read_text().splitlines()
+
+    out = tmp_path / "resumed.jsonl"
+    out.write_text("\n".join(lines[:3]) + "\n" + lines[3][:10])  # crash mid-write
+    assert completed_ids(str(out)) == {json.loads(l)["id"] for l in lines[:3]}
+    run_benchmark(str(tmp_path), str(out), workers=1)
+    assert _records(out) == _records(full)
+
+
+def _double(chunk):
+    return [{"id": it["id"], "value": 2 * it["x"]} for it in chunk]
+
+
+def test_run_sharded_consumes_lazy_items(tmp_path: Path):
+    from biomed_rag.eval.benchmark import run_sharded
+
+    out = tmp_path / "out.jsonl"
+    pulled = []
+
+    def items(n):
+        for i in range(n):
+            pulled.append(i)
+            yield {"id": f"q{i}", "x": i}
+
+    assert run_sharded(items(5), _double, str(out), workers=2, chunk_size=2) == 5
+    assert run_sharded(items(7), _double, str(out), workers=2, chunk_size=2) == 2
+    assert sorted(r["value"] for r in _records(out)) == [0, 2, 4, 6, 8, 10, 12]
+    assert len(pulled) == 12
+
+
+def test_progress_collapses_ranges_into_prefix(tmp_path: Path):
+    from biomed_rag.eval.benchmark import Progress
+
+    p = Progress()
+    p.add(4, 6)
+    p.add(2, 4)
+    assert p.done == 0 and p.ranges == [[2, 4], [4, 6]] and 5 in p and 1 not in p
+    p.add(0, 2)
+    assert p.done == 6 and p.ranges == []
+    p.bytes = 10
+    p.save(str(tmp_path / "p.json"))
+    assert vars(Progress.load(str(tmp_path / "p.json"))) == vars(p)
+    assert Progress.load(str(tmp_path / "missing.json")) is None
+
+
+def test_run_sharded_drops_uncommitted_results(tmp_path: Path):
+    from biomed_rag.eval.benchmark import progress_path, run_sharded
+
+    out = tmp_path / "out.jsonl"
+    items = [{"id": f"q{i}", "x": i} for i in range(6)]
+    assert run_sharded(items[:4], _double, str(out), chunk_size=2) == 4
+    committed = json.loads(Path(progress_path(str(out))).read_text())
+    assert committed["done"] == 4 and committed["bytes"] == out.stat().st_size
+    with open(out, "a") as f:  # a chunk written but never recorded, then a torn line
+        f.write(json.dumps({"id": "q4", "value": -1}) + "\n" + '{"id": "q5", "val')
+    assert run_sharded(items, _double, str(out), workers=2, chunk_size=1) == 2
+    assert [r["value"] for r in _records(out)] == [0, 2, 4, 6, 8, 10]
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from biomed_rag.eval.bootstrap import bootstrap_ci, bootstrap_distribution
+from biomed_rag.eval.metrics import pearson_r, pearson_r_vectorized
+
+
+def _mean(x):
+    return np.mean(x, axis=-1)
+
+
+def test_pearson_r_vectorized_matches_scalar():
+    rng = np.random.default_rng(0)
+    x = rng.random((5, 30))
+    y = x + rng.normal(0, 0.3, (5, 30))
+    expected = [pearson_r(a.tolist(), b.tolist()) for a, b in zip(x, y)]
+    assert pearson_r_vectorized(x, y) == pytest.approx(expected)
+    assert pearson_r_vectorized([0.1, 0.1, 0.1], [1.0, 2.0, 3.0]) == 0.0
+
+
+def test_distribution_independent_of_chunking_and_jobs():
+    x = np.arange(50, dtype=float)
+    a = bootstrap_distribution(_mean, x, n_resamples=200, max_cells=50 * 64)
+    b = bootstrap_distribution(_mean, x, n_resamples=200, max_cells=50 * 64, n_jobs=2)
+    assert np.array_equal(a, b)
+    assert len(a) == 200
+
+
+def test_percentile_and_bca_cover_mean():
+    rng = np.random.default_rng(3)
+    x = rng.normal(10.0, 2.0, 400)
+    for method in ("percentile", "bca"):
+        res = bootstrap_ci(_mean, x, n_resamples=2000, method=method)
+        assert res.low < res.estimate < res.high
+        assert res.high - res.low == pytest.approx(2 * 1.96 * 2.0 / 20, rel=0.25)
+
+
+def test_pearson_ci():
+    rng = np.random.default_rng(4)
+    f = rng.uniform(0.6, 0.95, 100)
+    t = 4.1 * f + rng.normal(0, 0.3, 100)
+    res = bootstrap_ci(pearson_r_vectorized, f, t, n_resamples=1000, method="bca")
+    assert res.estimate == pytest.approx(pearson_r(f.tolist(), t.tolist()))
+    assert res.low < res.estimate < res.high <= 1.0
+    with pytest.raises(ValueError):
+        bootstrap_ci(pearson_r_vectorized, f, t[:-1])
+    with pytest.raises(ValueError):
+        bootstrap_ci(_mean, f, method="basic")
@@ -0,0 +1,43 @@
+import json
+import os
+
+from biomed_rag.data.cache import cache_path, cached_load, clear_cache, parse_json_array
+
+
+def _counting(builds):
+    def build(path):
+        builds.append(path)
+        return parse_json_array(path)
+    return build
+
+
+def test_cached_load_rebuilds_only_on_change(tmp_path):
+    src = tmp_path / "notes.json"
+    src.write_text(json.dumps([{"text": "a"}]))
+    builds = []
+    build = _counting(builds)
+
+    assert cached_load(str(src), build) == [{"text": "a"}]
+    assert cached_load(str(src), build) == [{"text": "a"}]
+    assert len(builds) == 1 and cache_path(str(src)).exists()
+
+    cached_load(str(src), build, config={"lowercase": True})  # new preprocessing config
+    assert len(builds) == 2
+
+    src.write_text(json.dumps([{"text": "a"}, {"text": "b"}]))
+    os.utime(src, ns=(1, 1))
+    assert len(cached_load(str(src), build)) == 2
+    assert len(builds) == 3
+
+
+def test_cached_load_recovers_from_corrupt_cache(tmp_path):
+    src = tmp_path / "notes.json"
+    src.write_text("[1, 2]")
+    builds = []
+    cached_load(str(src), _counting(builds))
+    cache_path(str(src)).write_bytes(b"garbage")
+    assert cached_load(str(src), _counting(builds)) == [1, 2]
+    assert len(builds) == 2
+    assert cached_load(str(src), _counting(builds), enabled=False) == [1, 2]
+    assert len(builds) == 3
+    assert clear_cache(str(src)) == 1 and not cache_path(str(src)).exists()
@@ -0,0 +1,81 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from biomed_rag.trust.calibrate import calibrate, candidate_losses, load_rows, simplex_grid, write_weights
+from biomed_rag.trust.trust_scorer import compute_trust_score
+from biomed_rag.utils import Config
+
+
+def _rows(n=300, weights=None, seed=0):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for _ in range(n):
+        r = {"exact_match": rng.random(), "rationale_length": int(rng.integers(0, 11)), "fact_score": rng.random()}
+        r["human_rating"] = compute_trust_score(r["exact_match"], r["rationale_length"], r["fact_score"], weights)
+        rows.append(r)
+    return rows
+
+
+def test_simplex_grid_sums_to_one():
+    W = simplex_grid(0.1)
+    assert W.shape == (66, 3)
+    assert np.allclose(W.sum(axis=1), 1.0) and (W >= 0).all()
+
+
+def test_calibrate_recovers_weights(tmp_path: Path):
+    fp = tmp_path / "rows.jsonl"
+    fp.write_text("\n".join(json.dumps(r) for r in _rows(weights={"C": 0.6, "Tr": 0.1, "F": 0.3})))
+    X, y = load_rows(str(fp))
+    for objective in ("mse", "pearson"):
+        w, loss = calibrate(X, y, step=0.05, objective=objective, max_cells=1000)
+        assert w == pytest.approx({"C": 0.6, "Tr": 0.1, "F": 0.3}, abs=1e-9)
+
+
+def test_candidate_losses_matches_scalar_mse():
+    rows = _rows(20)
+    X = np.array([[r["exact_match"], r["rationale_length"] / 10.0, r["fact_score"]] for r in rows])
+    y = np.array([r["human_rating"] for r in rows])
+    W = np.array([[0.5, 0.25, 0.25]])
+    scalar = np.mean([(compute_trust_score(r["exact_match"], r["rationale_length"], r["fact_score"],
+                                           {"C": 0.5, "Tr": 0.25, "F": 0.25}) - r["human_rating"]) ** 2
+                      for r in rows])
+    assert candidate_losses(W, X, y)[0] == pytest.approx(scalar)
+    with pytest.raises(ValueError):
+        candidate_losses(W, X, y, objective="mae")
+
+
+def test_write_weights_roundtrip(tmp_path: Path):
+    pytest.importorskip("yaml")
+    src = Path(__file__).resolve().parents[1] / "config.yaml"
+    out = tmp_path / "config.yaml"
+    write_weights(str(src), {"C": 0.55, "Tr": 0.15, "F": 0.3}, str(out))
+    cfg = Config.load(str(out))
+    assert cfg.get("trust")["weights"] == {"C": 0.55, "Tr": 0.15, "F": 0.3}
+    assert cfg.get("seed") == 42
+    # only the weights block changes; comments and key order survive
+    before, after = src.read_text().splitlines(), out.read_text().splitlines()
+    changed = [(a, b) for a, b in zip(before, after) if a != b]
+    assert changed == [("    C: 0.4", "    C: 0.55"), ("    Tr: 0.3", "    Tr: 0.15")]
+    assert "  nli_backend: \"lexical\"  # \"hf\" scores with nli_model_name (needs transformers)" in after
+
+
+def test_write_weights_adds_missing_block(tmp_path: Path):
+    pytest.importorskip("yaml")
+    weights = {"C": 0.5, "Tr": 0.2, "F": 0.3}
+    for text in ("seed: 1  # keep\n", "trust:\n  threshold: 3\nseed: 1\n"):
+        fp = tmp_path / "c.yaml"
+        fp.write_text(text)
+        write_weights(str(fp), weights)
+        cfg = Config.load(str(fp))
+        assert cfg.get("trust")["weights"] == weights and cfg.get("seed") == 1
+        assert fp.read_text().startswith(text.splitlines()[0])
+
+
+def test_load_rows_requires_ratings(tmp_path: Path):
+    fp = tmp_path / "rows.json"
+    fp.write_text(json.dumps([{"exact_match": 1, "rationale_length": 5, "fact_score": 0.5}]))
+    with pytest.raises(ValueError):
+        load_rows(str(fp))
@@ -0,0 +1,44 @@
+import gzip
+import json
+
+import numpy as np
+
+from biomed_rag.data.columnar import ColumnarCorpus, convert
+
+NOTES = [
+    {"subject_id": 1, "hadm_id": 30, "chartdate": "2020-01-02", "category": "ECG", "text": "ST elevation — MI", "row_id": 0},
+    {"subject_id": 2, "hadm_id": 10, "chartdate": "2020-03-04", "category": "Radiology", "text": "Pneumonia", "row_id": 1},
+    {"subject_id": 3, "hadm_id": 20, "chartdate": "2020-05-06", "category": "ECG", "text": "", "row_id": 2},
+    {"subject_id": 1, "hadm_id": 30, "chartdate": "2020-01-03", "category": "Physician", "text": "MI follow-up", "row_id": 3},
+]
+DIAGNOSES = [
+    {"hadm_id": 30, "icd9_code": "J18.9", "short_title": "Pneumonia", "seq_num": 2},
+    {"hadm_id": 10, "icd9_code": "J18.9", "short_title": "Pneumonia", "seq_num": 1},
+    {"hadm_id": 30, "icd9_code": "I21.9", "short_title": "Acute myocardial infarction", "seq_num": 1},
+]
+
+
+def _naive_notes_with(code):
+    hadms = {d["hadm_id"] for d in DIAGNOSES if d["icd9_code"] == code}
+    return [i for i, n in enumerate(NOTES) if n["hadm_id"] in hadms]
+
+
+def test_convert_roundtrip_and_join_index(tmp_path):
+    notes_fp = tmp_path / "notes.json"
+    notes_fp.write_text(json.dumps(NOTES, indent=2))
+    dx_fp = tmp_path / "dx.jsonl.gz"
+    with gzip.open(dx_fp, "wt") as f:
+        f.write("\n".join(json.dumps(d) for d in DIAGNOSES) + "\n")
+    meta = convert(str(notes_fp), [str(dx_fp)], str(tmp_path / "col"))
+    assert meta["n_notes"] == 4 and meta["n_diagnoses"] == 3
+
+    corpus = ColumnarCorpus(str(tmp_path / "col"))
+    assert len(corpus) == 4
+    assert [corpus.note(i) for i in range(len(corpus))] == NOTES
+    assert corpus.codes_for(30) == ["I21.9", "J18.9"]  # ordered by seq_num
+    assert corpus.codes_for(20) == [] and corpus.codes_for(99) == []
+    for code in ("I21.9", "J18.9"):
+        assert corpus.notes_with_code(code).tolist() == _naive_notes_with(code)
+    assert corpus.notes_with_code("I21.9", "J18.9").tolist() == [0, 1, 3]
+    assert corpus.notes_with_code("Z99").size == 0
+    assert isinstance(corpus.note_hadm_id, np.memmap)
@@ -6,3 +6,24 @@ def test_rouge_fact_bounds():
     assert rouge_fact(0.8, 0.9) == pytest.approx(0.72, abs=1e-9)
     assert rouge_fact(1.2, 0.9) == 1.0
     assert rouge_fact(-0.1, 0.5) == 0.0
+
+
+def test_rouge_fact_batch_matches_scalar():
+    import numpy as np
+    from biomed_rag.core.consistency_scorer import rouge_fact_batch
+
+    rng = np.random.default_rng(0)
+    r = rng.uniform(-0.2, 1.3, 1000)
+    n = rng.uniform(-0.2, 1.3, 1000)
+    out = rouge_fact_batch(r, n)
+    assert out.tolist() == [rouge_fact(a, b) for a, b in zip(r.tolist(), n.tolist())]
+
+
+def test_rouge_fact_batch_matches_scalar_on_nan_and_inf():
+    import numpy as np
+    from biomed_rag.core.consistency_scorer import rouge_fact_batch
+
+    r = np.array([np.nan, 0.5, np.inf, -np.inf, 2.0, -3.0, np.nan])
+    n = np.array([0.5, np.nan, 0.5, 0.5, 0.9, 0.2, np.nan])
+    out = rouge_fact_batch(r, n)
+    assert out.tolist() == [rouge_fact(a, b) for a, b in zip(r.tolist(), n.tolist())]
@@ -27,3 +27,52 @@ def test_fact_pairs_synthetic_load():
     data = load_fact_pairs(str(Path(__file__).resolve().parents[1]))
     assert len(data) >= 2
     assert {"claim", "evidence", "label"}.issubset(data[0].keys())
+
+
+def test_loaders_read_json_arrays_lazily(tmp_path: Path):
+    import json
+
+    samples = tmp_path / "data" / "samples"
+    samples.mkdir(parents=True)
+    (samples / "medqa.json").write_text(json.dumps([{"question": f"q{i}"} for i in range(10)]))
+    (samples / "pubmedqa.json").write_text(json.dumps([{"question": f"q{i}"} for i in range(10)]))
+    (samples / "fact_pairs.json").write_text(json.dumps([{"claim": f"c{i}"} for i in range(10)]))
+    assert [r["question"] for r in load_medqa(str(tmp_path), max_items=3)] == ["q0", "q1", "q2"]
+    assert len(load_pubmedqa(str(tmp_path), max_items=4)) == 4
+    assert len(load_fact_pairs(str(tmp_path))) == 10
+    # a capped load streams the head and leaves no cache behind; full loads are cached
+    assert not (samples / ".cache").exists()
+    full = load_medqa(str(tmp_path), max_items=None)
+    assert len(full) == 10 and (samples / ".cache" / "medqa.json.parsed.pkl").exists()
+    assert load_medqa(str(tmp_path), max_items=None) == full
+    assert load_medqa(str(tmp_path), max_items=None, use_cache=False) == full
+
+
+def test_mimic_samples_parallel_deid(tmp_path: Path):
+    import json
+    from biomed_rag.data.mimic_loader import iter_mimic_samples
+
+    samples = tmp_path / "data" / "samples"
+    samples.mkdir(parents=True)
+    recs = [{"patient_id": f"P{i}", "note": f"Patient {i} Name listed"} for i in range(50)]
+    (samples / "mimic_samples.jsonl").write_text("\n".join(json.dumps(r) for r in recs))
+    seq = load_mimic_samples(str(tmp_path))
+    par = list(iter_mimic_samples(str(tmp_path), workers=2, chunk_bytes=200))
+    assert seq == par and len(seq) == 50
+    assert all("Patient" not in r["note"] and "Name" not in r["note"] for r in seq)
+
+
+def test_mimic_samples_cache_invalidates_on_edit(tmp_path: Path):
+    import json
+    from biomed_rag.data.cache import cache_path
+
+    samples = tmp_path / "data" / "samples"
+    samples.mkdir(parents=True)
+    fp = samples / "mimic_samples.jsonl"
+    fp.write_text(json.dumps({"patient_id": "P1", "note": "Patient Name stable"}) + "\n")
+    first = load_mimic_samples(str(tmp_path))
+    assert first[0]["note"] == "P. N. stable"
+    assert cache_path(str(fp), "deid").exists()
+    assert load_mimic_samples(str(tmp_path)) == first
+    fp.write_text(fp.read_text() + json.dumps({"patient_id": "P2", "note": "ok"}) + "\n")
+    assert [s["patient_id"] for s in load_mimic_samples(str(tmp_path))] == ["P1", "P2"]
@@ -0,0 +1,44 @@
+import random
+
+from biomed_rag.deid import AhoCorasick, DeidEngine
+from biomed_rag.utils import privacy_guard, privacy_guard_batch
+
+
+def test_aho_corasick_finds_all_overlapping_matches():
+    ac = AhoCorasick(["he", "she", "his", "hers"])
+    hits = {(s, e, ac.patterns[p]) for s, e, p in ac.finditer("ushers")}
+    assert hits == {(1, 4, "she"), (2, 4, "he"), (2, 6, "hers")}
+
+
+def test_aho_corasick_matches_naive_search():
+    rng = random.Random(0)
+    words = ["".join(rng.choice("abc") for _ in range(rng.randint(1, 4))) for _ in range(30)]
+    text = "".join(rng.choice("abc") for _ in range(300))
+    ac = AhoCorasick(words)
+    got = sorted((s, e) for s, e, _ in ac.finditer(text))
+    expected = sorted(
+        (i, i + len(w)) for w in set(words) for i in range(len(text)) if text.startswith(w, i)
+    )
+    assert got == expected
+
+
+def test_engine_leftmost_longest_and_patterns():
+    eng = DeidEngine({"John": "[NAME]", "John Smith": "[NAME]", "Boston": "[LOC]"})
+    out = eng.scrub("John Smith (MRN: 1234567) seen in Boston on 03/14/2021, call 617-555-0199.")
+    assert out == "[NAME] ([MRN]) seen in [LOC] on [DATE], call [PHONE]."
+
+
+def test_engine_case_insensitive_whole_word(tmp_path):
+    fp = tmp_path / "terms.tsv"
+    fp.write_text("ann\t[NAME]\n")
+    eng = DeidEngine.from_file(str(fp), patterns={}, case_insensitive=True, whole_word=True)
+    assert eng.scrub("ANN reviewed the annual scan with Ann.") == "[NAME] reviewed the annual scan with [NAME]."
+
+
+def test_privacy_guard_matches_legacy_replace():
+    texts = ["Patient Name: John Doe", "PatientName", "no phi here", "",
+             "Patient seen 03/14/2021, MRN 1234567, call (555) 123-4567"]
+    legacy = [t.replace("Patient", "P.").replace("Name", "N.") for t in texts]
+    assert [privacy_guard(t) for t in texts] == legacy
+    assert privacy_guard_batch(texts) == legacy
+    assert privacy_guard_batch(texts, enable=False) == texts
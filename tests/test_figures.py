@@ -0,0 +1,49 @@
+import pytest
+
+from biomed_rag.figures import BUILT, UP_TO_DATE, FigureSpec, build_figures, load_manifest
+
+
+def _write_a(data):
+    with open(data["dir"] + "/a.txt", "w") as f:
+        f.write(str(data["a"]))
+
+
+def _write_b(data):
+    with open(data["dir"] + "/b.txt", "w") as f:
+        f.write(str(data["b"]))
+
+
+def _fail(data):
+    raise RuntimeError("boom")
+
+
+def _specs(tmp_path):
+    return [
+        FigureSpec("a", _write_a, [str(tmp_path / "a.txt")], inputs=lambda d: d["a"]),
+        FigureSpec("b", _write_b, [str(tmp_path / "b.txt")], inputs=lambda d: d["b"]),
+    ]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_build_figures_only_redraws_changed(tmp_path, workers):
+    manifest = str(tmp_path / "manifest.json")
+    data = {"dir": str(tmp_path), "a": 1, "b": 1}
+    assert build_figures(_specs(tmp_path), data, manifest, workers=workers) == {"a": BUILT, "b": BUILT}
+    assert build_figures(_specs(tmp_path), data, manifest, workers=workers) == {"a": UP_TO_DATE, "b": UP_TO_DATE}
+
+    data["b"] = 2
+    assert build_figures(_specs(tmp_path), data, manifest, workers=workers) == {"a": UP_TO_DATE, "b": BUILT}
+    assert (tmp_path / "b.txt").read_text() == "2"
+
+    (tmp_path / "a.txt").unlink()
+    assert build_figures(_specs(tmp_path), data, manifest)["a"] == BUILT
+    assert build_figures(_specs(tmp_path), data, manifest, force=True) == {"a": BUILT, "b": BUILT}
+    assert build_figures(_specs(tmp_path), data, manifest, shared_params={"dpi": 600})["a"] == BUILT
+
+
+def test_build_figures_records_successes_before_raising(tmp_path):
+    manifest = str(tmp_path / "manifest.json")
+    specs = _specs(tmp_path)[:1] + [FigureSpec("bad", _fail, inputs=lambda d: None)]
+    with pytest.raises(RuntimeError):
+        build_figures(specs, {"dir": str(tmp_path), "a": 1, "b": 1}, manifest, workers=2)
+    assert set(load_manifest(manifest)) == {"a"}
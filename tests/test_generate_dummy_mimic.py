@@ -0,0 +1,48 @@
+import gzip
+import json
+from pathlib import Path
+
+import pytest
+
+from generate_dummy_mimic import StreamConfig, generate_stream, shard_bounds, shard_paths
+
+
+@pytest.mark.parametrize("n_records,shards", [(0, 1), (10, 3), (7, 7), (5, 8), (1000, 16)])
+def test_shard_bounds_partition_range(n_records, shards):
+    bounds = [shard_bounds(n_records, shards, k) for k in range(shards)]
+    assert bounds[0][0] == 0 and bounds[-1][1] == n_records
+    assert all(a[1] == b[0] for a, b in zip(bounds, bounds[1:]))
+    assert all(lo <= hi for lo, hi in bounds)
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_stream_output_independent_of_workers(tmp_path: Path, compress):
+    cfg = StreamConfig(n_records=50, shards=4, vocab_size=200, batch_size=7, compress=compress)
+    one, three = tmp_path / "w1", tmp_path / "w3"
+    m1 = generate_stream(cfg, str(one), workers=1)
+    m3 = generate_stream(cfg, str(three), workers=3)
+    assert m1 == m3
+    files = sorted(p.name for p in one.iterdir())
+    assert files == sorted(p.name for p in three.iterdir()) and len(files) == 2 * cfg.shards + 1
+    for name in files:
+        assert (one / name).read_bytes() == (three / name).read_bytes(), name
+
+
+def test_stream_gzip_readable_and_manifest_counts(tmp_path: Path):
+    cfg = StreamConfig(n_records=23, shards=3, vocab_size=100, batch_size=5, compress=True)
+    manifest = generate_stream(cfg, str(tmp_path))
+    assert json.loads((tmp_path / "manifest.json").read_text()) == manifest
+    rows = []
+    n_dx = 0
+    for k, shard in enumerate(manifest["shards"]):
+        notes_path, dx_path = shard_paths(tmp_path, k, cfg)
+        with gzip.open(notes_path, "rt") as f:
+            notes = [json.loads(line) for line in f]
+        with gzip.open(dx_path, "rt") as f:
+            dx = [json.loads(line) for line in f]
+        assert shard["notes"] == len(notes) and shard["diagnoses"] == len(dx)
+        assert {d["hadm_id"] for d in dx} <= {n["hadm_id"] for n in notes}
+        rows += [n["row_id"] for n in notes]
+        n_dx += len(dx)
+    assert rows == list(range(cfg.n_records))
+    assert manifest["notes"] == cfg.n_records and manifest["diagnoses"] == n_dx
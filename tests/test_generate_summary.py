@@ -0,0 +1,87 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from generate_summary import METRICS, fisher_ci, render_stream, stream_summary, summarize_json
+
+
+def _records(n=60, seed=0):
+    rng = np.random.default_rng(seed)
+    out = []
+    for i in range(n):
+        fact = float(rng.uniform(0.3, 1.0))
+        out.append({"query": f"query {i} with 50% & _x_", "dataset": ["medqa", "pubmedqa", "factcc"][i % 3],
+                    "fact_score": fact, "trust": float(np.clip(5 * fact + rng.normal(0, 0.4), 1, 5)),
+                    "rouge_f": float(rng.random()), "nli_score": float(rng.random()),
+                    "exact_match": float(rng.integers(0, 2))})
+    return out
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_stream_summary_matches_in_memory(tmp_path: Path, workers):
+    recs = _records()
+    fp = tmp_path / "runs.jsonl"
+    fp.write_text("\n".join(json.dumps(r) for r in recs) + "\n")
+    acc = stream_summary(str(fp), by=["dataset"], workers=workers, chunk_bytes=1024, preview=5)
+    df = pd.DataFrame(recs)
+    for m in METRICS:
+        assert acc.stats[m].mean == pytest.approx(df[m].mean())
+        assert acc.stats[m].std == pytest.approx(df[m].std())
+    assert acc.corr.r == pytest.approx(np.corrcoef(df["fact_score"], df["trust"])[0, 1])
+    assert [q for q, _, _ in acc.rows] == list(df["query"][:5])
+    for name, g in df.groupby("dataset"):
+        sub = acc.groups[("dataset", name)]
+        assert sub.stats["fact_score"].count == len(g)
+        assert sub.stats["trust"].mean == pytest.approx(g["trust"].mean())
+        assert sub.stats["trust"].std == pytest.approx(g["trust"].std())
+        assert sub.corr.r == pytest.approx(np.corrcoef(g["fact_score"], g["trust"])[0, 1])
+
+    summary, latex = render_stream(acc, fp.name)
+    assert any("Per-Category Breakdown" in line for line in summary)
+    body = latex[latex.index("\\midrule") + 1:latex.index("\\bottomrule")]
+    assert len(body) == 4 and all(row.endswith(" \\\\") for row in body)
+
+
+def test_summarize_json_latex_rows_terminate_with_double_backslash(tmp_path: Path):
+    fp = tmp_path / "results.json"
+    fp.write_text(json.dumps(_records(8)))
+    _, latex = summarize_json(fp)
+    body = latex[latex.index("\\midrule") + 1:latex.index("\\bottomrule")]
+    assert len(body) == 8 and all(row.endswith(" \\\\") for row in body)
+    assert latex[latex.index("\\midrule") - 1].endswith(" \\\\")
+    assert "50\\% and \\_x\\_" in body[0]
+
+
+def test_fisher_ci():
+    low, high = fisher_ci(0.8, 50)
+    assert low < 0.8 < high and -1 <= low and high <= 1
+    assert fisher_ci(0.5, 3) == (-1.0, 1.0)
+    assert fisher_ci(1.0, 10) == (1.0, 1.0)
+
+
+def test_summary_r_and_ci_come_from_one_estimator(tmp_path: Path):
+    recs = _records(20)
+    fp = tmp_path / "results.json"
+    fp.write_text(json.dumps(recs))
+    summary, _ = summarize_json(fp)
+    r = np.corrcoef([x["fact_score"] for x in recs], [x["trust"] for x in recs])[0, 1]
+    line = next(s for s in summary if "Observed Pearson r:" in s)
+    assert line.split()[3] == f"{r:.3f}"
+    assert f"observed r={r:.2f}," in "\n".join(summary)
+
+
+def test_summary_reports_undefined_r_for_constant_column(tmp_path: Path):
+    recs = [dict(x, trust=1.0) for x in _records(12)]
+    fp = tmp_path / "results.json"
+    fp.write_text(json.dumps(recs))
+    fj = tmp_path / "results.jsonl"
+    fj.write_text("\n".join(json.dumps(x) for x in recs) + "\n")
+    for summary, latex in (summarize_json(fp),
+                           render_stream(stream_summary(str(fj), by=["dataset"]), fj.name)):
+        text = "\n".join(summary)
+        assert "undefined" in text and "nan" not in text.lower() and "CI [1.00,1.00]" not in text
+        assert "r in expected band (0.70–1.00): False" in text
+    assert latex[latex.index("\\bottomrule") - 1].endswith("& -- \\\\")
@@ -23,3 +23,41 @@ def test_precision_at_k():
     retr.add_documents(docs)
     prec = retr.precision_at_k("beta", positives=[0,1], k=2)
     assert 0.0 <= prec <= 1.0
+
+
+def test_retrieve_iterative_single_round_matches_retrieve():
+    retr = HybridRetriever()
+    retr.add_documents(["alpha beta", "beta gamma", "gamma delta", "epsilon zeta"])
+    it = retr.retrieve_iterative("beta", k=2, max_iterations=1)
+    assert it.rounds == 1 and it.expansion_terms == []
+    assert it.docs == retr.retrieve("beta", k=2)
+
+
+def test_retrieve_iterative_matches_full_rescoring():
+    from collections import Counter
+
+    corpus = [
+        "troponin elevation suggests cardiac injury",
+        "cardiac injury follows myocardial infarction",
+        "aspirin reduces myocardial infarction mortality",
+        "sepsis causes hypotension and tachycardia",
+        "troponin assay sensitivity remains high",
+        "beta blockers after myocardial infarction reduce mortality",
+    ]
+    retr = HybridRetriever()
+    retr.add_documents(corpus)
+    query = "troponin elevation"
+    it = retr.retrieve_iterative(query, k=3, max_iterations=3, expansion_terms=2)
+    assert 1 < it.rounds <= 3
+    # brute force: rescore every doc with the final expanded lexical query
+    q_counts = Counter(query.lower().split()) + Counter(it.expansion_terms)
+    expected = []
+    for i, doc in enumerate(corpus):
+        toks = doc.lower().split()
+        bm25 = sum(min(c, toks.count(t)) for t, c in q_counts.items()) / (len(toks) + 1)
+        dense = retr.retrieve(query, k=len(corpus))
+        d = next(r.dense for r in dense if r.doc_id == i)
+        expected.append((i, retr.fuse(bm25, d)))
+    expected.sort(key=lambda x: (-x[1], x[0]))
+    assert [r.doc_id for r in it.docs] == [i for i, _ in expected[:3]]
+    assert [r.score for r in it.docs] == [s for _, s in expected[:3]]
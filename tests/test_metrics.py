@@ -31,3 +31,87 @@ def test_aggregate_results():
     assert "acc_mean" in agg
     assert "f1_mean" in agg
     assert agg["acc_mean"] == pytest.approx(0.9, abs=0.01)
+
+
+def _auc_pairs(preds, labels):
+    pos = [p for p, l in zip(preds, labels) if l]
+    neg = [p for p, l in zip(preds, labels) if not l]
+    wins = sum(1.0 if a > b else 0.5 if a == b else 0.0 for a in pos for b in neg)
+    return wins / (len(pos) * len(neg))
+
+
+def test_auc_roc_matches_pairwise_with_ties():
+    import numpy as np
+    from biomed_rag.eval.metrics import auc_roc
+
+    rng = np.random.default_rng(0)
+    preds = np.round(rng.random(300), 1)  # heavy ties
+    labels = rng.random(300) < preds
+    assert auc_roc(preds, labels) == pytest.approx(_auc_pairs(preds.tolist(), labels.tolist()))
+    assert auc_roc([0.9, 0.8, 0.1, 0.2], [1, 1, 0, 0]) == 1.0
+    assert auc_roc([0.3, 0.4], [1, 1]) == 0.5
+
+
+def test_streaming_auc_merge_and_accuracy():
+    import numpy as np
+    from biomed_rag.eval.metrics import StreamingAUC, auc_roc
+
+    rng = np.random.default_rng(1)
+    preds = rng.random(20000)
+    labels = rng.random(20000) < preds
+    parts = [StreamingAUC().update(preds[i::4], labels[i::4]) for i in range(4)]
+    merged = parts[0]
+    for part in parts[1:]:
+        merged.merge(part)
+    assert merged.value() == pytest.approx(auc_roc(preds, labels), abs=1e-3)
+    with pytest.raises(ValueError):
+        merged.merge(StreamingAUC(n_bins=10))
+    assert StreamingAUC().value() == 0.5
+
+
+def test_streaming_aggregator_matches_aggregate_results(tmp_path):
+    import json
+    import numpy as np
+    from biomed_rag.eval.metrics import StreamingAggregator, aggregate_jsonl
+
+    rng = np.random.default_rng(0)
+    runs = [{"query": f"q{i}", "fact_score": float(rng.random()), "trust": float(rng.uniform(1, 5)),
+             "rationale_length": int(rng.integers(5, 11))} for i in range(101)]
+    expected = aggregate_results(runs)
+
+    shards = [StreamingAggregator().update_many(runs[i::3]) for i in range(3)]
+    merged = shards[0].merge(shards[1]).merge(shards[2]).result()
+    assert merged.keys() == expected.keys()
+    for k in expected:
+        assert merged[k] == pytest.approx(expected[k], rel=1e-12)
+
+    fp = tmp_path / "runs.jsonl"
+    fp.write_text("\n".join(json.dumps(r) for r in runs))
+    assert aggregate_jsonl(str(fp)) == pytest.approx(expected, rel=1e-12)
+    assert StreamingAggregator().update({"x": 1.0}).result() == {"x_mean": 1.0, "x_std": 0.0}
+
+
+def test_running_correlation_merge_matches_batch():
+    import numpy as np
+    from biomed_rag.eval.metrics import RunningCorrelation, RunningStats
+
+    rng = np.random.default_rng(0)
+    x = rng.random(1000)
+    y = 0.8 * x + rng.normal(0, 0.1, 1000)
+    parts = [RunningCorrelation().update_batch(x[i::4], y[i::4]) for i in range(4)]
+    merged = parts[0]
+    for p in parts[1:]:
+        merged.merge(p)
+    one_by_one = RunningCorrelation()
+    for a, b in zip(x[:10], y[:10]):
+        one_by_one.update(a, b)
+    assert merged.count == 1000
+    assert abs(merged.r - np.corrcoef(x, y)[0, 1]) < 1e-12
+    assert abs(one_by_one.r - np.corrcoef(x[:10], y[:10])[0, 1]) < 1e-12
+    assert RunningCorrelation().update_batch(np.full(5, 0.1), np.arange(5)).r == 0.0
+    assert RunningCorrelation().update_batch(np.full(5, 0.1), np.arange(5)).degenerate
+    assert RunningCorrelation().update(1.0, 2.0).degenerate
+    assert not RunningCorrelation().update_batch(np.arange(5), np.arange(5) ** 2).degenerate
+
+    stats = RunningStats().update_batch(x[:500]).update_batch(x[500:]).update_batch([])
+    assert abs(stats.mean - x.mean()) < 1e-12 and abs(stats.std - x.std(ddof=1)) < 1e-12
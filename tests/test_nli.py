@@ -0,0 +1,100 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from biomed_rag.core.nli import (CachedNLIScorer, HFNLIBackend, LexicalNLIBackend, NLICache, build_nli_scorer,
+                                 cache_key, nli_config, nli_scorer_from_config)
+from biomed_rag.tracing import Tracer
+
+
+class CountingBackend(LexicalNLIBackend):
+    def __init__(self):
+        self.calls = []
+
+    def score_batch(self, pairs):
+        self.calls.append(list(pairs))
+        return super().score_batch(pairs)
+
+
+def test_lexical_backend_is_deterministic():
+    backend = LexicalNLIBackend()
+    pairs = [("troponin is elevated", "Troponin elevated in MI"), ("", "anything")]
+    assert backend.score_batch(pairs) == [pytest.approx(2 / 3), 0.0]
+    assert backend.score_batch(pairs) == backend.score_batch(pairs)
+
+
+def test_cached_scorer_dedupes_and_hits_lru():
+    backend = CountingBackend()
+    tracer = Tracer()
+    scorer = CachedNLIScorer(backend, tracer=tracer)
+    pairs = [("a b", "a"), ("c", "c d"), ("a b", "a")]
+    first = scorer.score_batch(pairs)
+    assert first == [0.5, 1.0, 0.5]
+    assert backend.calls == [[("a b", "a"), ("c", "c d")]]
+    assert scorer.score_batch(pairs) == first
+    assert len(backend.calls) == 1
+    assert tracer.sink.counters["nli_cache_hits"] == 2
+    assert tracer.sink.counters["nli_model_pairs"] == 2
+
+
+def test_sqlite_cache_survives_restart(tmp_path: Path):
+    db = str(tmp_path / "nli.sqlite")
+    scorer = CachedNLIScorer(CountingBackend(), NLICache(db))
+    scorer.score_batch([("x y", "x"), ("z", "z")])
+    scorer.cache.close()
+
+    backend = CountingBackend()
+    warm = CachedNLIScorer(backend, NLICache(db, lru_size=1))
+    assert warm.score_batch([("x y", "x"), ("z", "z")]) == [0.5, 1.0]
+    assert backend.calls == []
+
+
+def test_cache_key_includes_model():
+    assert cache_key("c", "e", "m1") != cache_key("c", "e", "m2")
+    assert cache_key("c", "e", "m1") == cache_key("c", "e", "m1")
+
+
+def test_mean_entailment_empty_evidence():
+    assert CachedNLIScorer().mean_entailment("claim", []) == 0.0
+
+
+def test_second_process_hits_sqlite_cache(tmp_path: Path):
+    db = str(tmp_path / "cache" / "nli.sqlite")
+    script = (
+        "import json, sys\n"
+        "from biomed_rag.core.nli import build_nli_scorer\n"
+        "from biomed_rag.tracing import Tracer\n"
+        "t = Tracer()\n"
+        "s = build_nli_scorer(cache_path=sys.argv[1], tracer=t)\n"
+        "s.score_batch([('troponin is elevated', 'Troponin elevated in MI'), ('x y', 'x')])\n"
+        "print(json.dumps(t.sink.counters))\n"
+    )
+    run = lambda: subprocess.run([sys.executable, "-c", script, db], capture_output=True, text=True,
+                                 check=True, cwd=Path(__file__).resolve().parents[1]).stdout
+    first, second = run(), run()
+    assert '"nli_model_pairs": 2' in first
+    assert '"nli_disk_hits": 2' in second and '"nli_model_pairs": 0' in second
+
+
+def test_nli_scorer_from_config_selects_model_and_cache(tmp_path: Path):
+    from biomed_rag.utils import Config
+
+    db = str(tmp_path / "nli.sqlite")
+    fc = {"nli_model_name": "roberta-large-mnli", "nli_cache_path": db}
+    lexical = nli_scorer_from_config(Config({"fact_checking": fc}))
+    assert isinstance(lexical.backend, LexicalNLIBackend) and lexical.cache._db is not None
+    hf = nli_scorer_from_config(Config({"fact_checking": {**fc, "nli_backend": "hf"}}))
+    assert isinstance(hf.backend, HFNLIBackend) and hf.backend.model_name == "roberta-large-mnli"
+    assert build_nli_scorer().cache._db is None
+
+
+def test_nli_config_flags_override_config():
+    from biomed_rag.utils import Config
+
+    cfg = Config({"fact_checking": {"nli_backend": "hf", "nli_model_name": "m", "nli_cache_path": "c.sqlite"}})
+    assert nli_config(cfg) == ("m", "c.sqlite")
+    assert nli_config(cfg, "lexical", "") == ("lexical", "")
+    assert nli_config(Config({"fact_checking": {"nli_model_name": "m"}})) == (None, None)
+    assert nli_config(Config({})) == (None, None)
@@ -0,0 +1,66 @@
+import sys
+
+import pytest
+
+from biomed_rag.pipeline import BLOCKED, FAILED, RAN, SKIPPED, Stage, dependencies, format_report, run_pipeline
+
+
+def _copy(src, dst):
+    return Stage(f"{src}->{dst}", [sys.executable, "-c", f"import shutil; shutil.copy({src!r}, {dst!r})"],
+                 inputs=[src], outputs=[dst])
+
+
+def _run(stages, tmp_path, **kw):
+    results = run_pipeline(stages, manifest_path=str(tmp_path / "manifest.json"),
+                           log_dir=str(tmp_path / "logs"), **kw)
+    return {r.name: r.status for r in results}
+
+
+def test_run_pipeline_skips_unchanged_and_reruns_downstream(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "a.txt").write_text("1")
+    stages = [_copy("b.txt", "c.txt"), _copy("a.txt", "b.txt")]  # declaration order is not run order
+    assert _run(stages, tmp_path) == {"b.txt->c.txt": RAN, "a.txt->b.txt": RAN}
+    assert (tmp_path / "c.txt").read_text() == "1"
+    assert _run(stages, tmp_path) == {"b.txt->c.txt": SKIPPED, "a.txt->b.txt": SKIPPED}
+
+    (tmp_path / "a.txt").write_text("2")
+    assert _run(stages, tmp_path) == {"b.txt->c.txt": RAN, "a.txt->b.txt": RAN}
+    assert (tmp_path / "c.txt").read_text() == "2"
+
+    (tmp_path / "c.txt").unlink()
+    assert _run(stages, tmp_path) == {"b.txt->c.txt": RAN, "a.txt->b.txt": SKIPPED}
+    assert _run(stages, tmp_path, force=True) == {"b.txt->c.txt": RAN, "a.txt->b.txt": RAN}
+
+
+def test_run_pipeline_runs_independent_stages_concurrently(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    # each stage waits until the other has started, so this only finishes if both run at once
+    wait = ("import os, time\nopen('{me}', 'w').close()\n"
+            "t = time.time() + 20\nwhile not os.path.exists('{other}') and time.time() < t: time.sleep(0.01)\n"
+            "raise SystemExit(0 if os.path.exists('{other}') else 1)")
+    stages = [Stage("x", [sys.executable, "-c", wait.format(me="x.started", other="y.started")]),
+              Stage("y", [sys.executable, "-c", wait.format(me="y.started", other="x.started")])]
+    assert _run(stages, tmp_path, workers=2) == {"x": RAN, "y": RAN}
+
+
+def test_run_pipeline_blocks_dependents_of_failures(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "a.txt").write_text("1")
+    broken = Stage("broken", [sys.executable, "-c", "print('nope')"], outputs=["b.txt"])
+    stages = [broken, _copy("b.txt", "c.txt"), _copy("a.txt", "d.txt")]
+    results = run_pipeline(stages, manifest_path=str(tmp_path / "m.json"), log_dir=str(tmp_path / "logs"))
+    assert [r.status for r in results] == [FAILED, BLOCKED, RAN]
+    assert "missing declared outputs" in (tmp_path / "logs" / "broken.log").read_text()
+    report = format_report(results, wall_seconds=1.0)
+    assert "blocked" in report and "wall clock" in report
+
+
+def test_dependencies_rejects_bad_graphs():
+    assert dependencies([_copy("a", "b"), _copy("b", "c")]) == {"a->b": [], "b->c": ["a->b"]}
+    with pytest.raises(ValueError, match="cycle"):
+        dependencies([_copy("a", "b"), _copy("b", "a")])
+    with pytest.raises(ValueError, match="unknown"):
+        dependencies([Stage("s", ["true"], deps=["nope"])])
+    with pytest.raises(ValueError, match="Duplicate"):
+        dependencies([Stage("s", ["true"]), Stage("s", ["true"])])
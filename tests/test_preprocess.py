@@ -20,3 +20,61 @@ def test_dp_sanitize_applies_privacy():
     text = "Patient presents with Name listed"
     out = dp_sanitize(text, epsilon=1.0)
     assert "Patient" not in out and "Name" not in out
+
+
+def test_inject_noise_explicit_rng_ignores_global_state():
+    from biomed_rag.utils import query_rng
+
+    text = "Aspirin reduces myocardial infarction risk in elderly patients"
+    set_seed(1)
+    out1 = inject_noise(text, noise_level=0.3, rng=query_rng(42, 3))
+    set_seed(2)
+    out2 = inject_noise(text, noise_level=0.3, rng=query_rng(42, 3))
+    assert out1 == out2
+    assert "<noisy>" in out1
+
+
+def test_tokenize_batch_csr_layout_and_shared_vocab():
+    import numpy as np
+    from biomed_rag.data.preprocess import tokenize_batch, Vocabulary
+
+    texts = ["Aspirin reduces MI risk.", "", "aspirin and MI"]
+    vocab = Vocabulary()
+    batch = tokenize_batch(texts, vocab)
+    assert batch.ids.dtype == np.int32
+    assert batch.offsets.tolist() == [0, 4, 4, 7]
+    assert batch.lengths.tolist() == [4, 0, 3]
+    assert [vocab.decode(row) for row in batch] == [tokenize(t) for t in texts]
+    assert batch[0][0] == batch[2][0]  # "aspirin" interned once
+    assert batch.texts() == [" ".join(tokenize(t)) for t in texts]
+    more = tokenize_batch(["risk of MI"], vocab)
+    assert len(vocab) == 6 and more.vocab is vocab and "of" in vocab
+    assert Vocabulary(["a", "b", "a"]).tokens == ["a", "b"]
+
+
+def test_inject_noise_batch_grid_is_seeded_and_nested():
+    import numpy as np
+    from biomed_rag.data.preprocess import NOISY_TOKEN, inject_noise_batch, tokenize_batch
+
+    texts = ["aspirin reduces myocardial infarction risk in elderly patients", "", "troponin elevated"]
+    batch = tokenize_batch(texts)
+    levels = [0.1, 0.5, 1.0]
+    out = inject_noise_batch(batch, levels, rng=np.random.default_rng(0))
+    again = inject_noise_batch(batch, levels, rng=np.random.default_rng(0))
+    assert all(np.array_equal(a.ids, b.ids) for a, b in zip(out, again))
+    noisy = batch.vocab.index[NOISY_TOKEN]
+    counts = [[int((row == noisy).sum()) for row in b] for b in out]
+    assert counts == [[1, 0, 1], [4, 0, 1], [8, 0, 2]]
+    low, high = (out[0].ids == noisy), (out[1].ids == noisy)
+    assert not (low & ~high).any()
+    assert np.array_equal(out[0].offsets, batch.offsets)
+
+
+def test_dp_sanitize_batch_matches_epsilon_rule():
+    import numpy as np
+    from biomed_rag.data.preprocess import NOISY_TOKEN, dp_sanitize_batch
+
+    texts = ["Patient presents with Name listed", "Patient stable"]
+    strict, loose = dp_sanitize_batch(texts, epsilons=[0.5, 2.0], rng=np.random.default_rng(1))
+    assert loose.texts() == ["p presents with n listed", "p stable"]
+    assert all(NOISY_TOKEN in t for t in strict.texts())
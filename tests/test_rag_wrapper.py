@@ -0,0 +1,70 @@
+from pathlib import Path
+
+from biomed_rag.rag_wrapper import RAGSystem, STAGES
+from biomed_rag.utils import set_seed
+
+CORPUS = [
+    "Aspirin reduces risk of myocardial infarction",
+    "ECG shows ST elevation in acute MI",
+    "Troponin levels are elevated in cardiac injury",
+]
+
+
+def test_process_stream_stage_order(tmp_path: Path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    rag = RAGSystem(CORPUS)
+    events = list(rag.process_stream("Troponin elevation in MI"))
+    assert tuple(e.stage for e in events) == STAGES
+    assert len(events[0].data["docs"]) == 3
+    assert (tmp_path / events[-1].data["heatmap_path"]).exists()
+
+
+def test_process_stream_early_cancel_skips_heatmap(tmp_path: Path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    rag = RAGSystem(CORPUS)
+    stream = rag.process_stream("Troponin elevation in MI")
+    first = next(stream)
+    stream.close()
+    assert first.stage == "retrieval"
+    assert not (tmp_path / "heatmap_tmp.png").exists()
+
+
+def test_process_matches_stream(tmp_path: Path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    rag = RAGSystem(CORPUS)
+    set_seed(7)
+    out = rag.process("Troponin elevation in MI")
+    set_seed(7)
+    ev = {e.stage: e.data for e in rag.process_stream("Troponin elevation in MI")}
+    assert out.fact_score == round(ev["fact_score"]["fact_score"], 3)
+    assert out.trust == round(ev["trust"]["trust"], 2)
+    assert out.metadata["retrieved_docs"] == 3
+
+
+def test_parallel_matches_sequential():
+    from concurrent.futures import ThreadPoolExecutor
+    from biomed_rag.utils import query_rng
+
+    rag = RAGSystem(CORPUS)
+    queries = ["Troponin elevation in MI", "Aspirin risk", "ST elevation ECG", "cardiac injury"]
+
+    def run(i):
+        return rag.process(queries[i], explain=False, rng=query_rng(42, i))
+
+    sequential = [run(i) for i in range(len(queries))]
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        parallel = list(pool.map(run, reversed(range(len(queries)))))[::-1]
+    assert parallel == sequential
+    batched = rag.process_batch(queries, rngs=[query_rng(42, i) for i in range(len(queries))])
+    assert batched == sequential
+
+
+def test_from_config_honors_max_iterations():
+    from biomed_rag.utils import Config, query_rng
+
+    cfg = Config({"inference": {"max_iterations": 3}, "retriever": {"bm25_weight": 0.6, "dense_weight": 0.4}})
+    rag = RAGSystem.from_config(CORPUS, cfg)
+    assert rag.max_iterations == 3 and rag.retriever.bm25_weight == 0.6
+    out = rag.process("Troponin elevation", explain=False, rng=query_rng(42, 0))
+    assert 1 <= out.metadata["retrieval_rounds"] <= 3
+    assert rag.process_batch(["Troponin elevation"], rngs=[query_rng(42, 0)]) == [out]
@@ -0,0 +1,58 @@
+import pytest
+
+from biomed_rag.core.rouge import RougeScorer, lcs_length, rouge_f
+
+
+def _lcs_dp(a, b):
+    prev = [0] * (len(b) + 1)
+    for x in a:
+        cur = [0]
+        for j, y in enumerate(b):
+            cur.append(prev[j] + 1 if x == y else max(prev[j + 1], cur[j]))
+        prev = cur
+    return prev[-1]
+
+
+def test_lcs_matches_dynamic_programming():
+    import random
+
+    rnd = random.Random(0)
+    for _ in range(200):
+        a = [rnd.randrange(6) for _ in range(rnd.randrange(0, 40))]
+        b = [rnd.randrange(6) for _ in range(rnd.randrange(0, 90))]
+        assert lcs_length(a, b) == _lcs_dp(a, b)
+
+
+def test_rouge_scores_known_values():
+    scorer = RougeScorer()
+    s = scorer.score("the cat sat on the mat", "the cat lay on the mat")
+    assert s["rouge1"].fmeasure == pytest.approx(5 / 6)
+    assert s["rouge2"].fmeasure == pytest.approx(3 / 5)
+    assert s["rougeL"].fmeasure == pytest.approx(5 / 6)
+    assert scorer.score("", "anything")["rougeL"].fmeasure == 0.0
+
+
+def test_score_batch_and_multi_reference():
+    scorer = RougeScorer()
+    pairs = [("troponin is elevated", "troponin elevated in MI"), ("aspirin", "troponin elevated in MI")]
+    batch = scorer.score_batch(pairs)
+    assert batch == [scorer.score(c, r) for c, r in pairs]
+    best = rouge_f("troponin is elevated", ["aspirin reduces risk", "troponin elevated in MI"])
+    assert best == batch[0]["rougeL"].fmeasure
+    with pytest.raises(ValueError):
+        RougeScorer(["rouge4"])
+
+
+def test_score_token_batch_shares_tokenization():
+    from biomed_rag.data.preprocess import Vocabulary, tokenize_batch
+
+    vocab = Vocabulary()
+    scorer = RougeScorer(vocab=vocab)
+    cands = tokenize_batch(["troponin is elevated", "aspirin"], vocab)
+    refs = tokenize_batch(["troponin elevated in MI", "aspirin reduces risk"], vocab)
+    assert scorer.score_token_batch(cands, refs) == [
+        scorer.score("troponin is elevated", "troponin elevated in MI"),
+        scorer.score("aspirin", "aspirin reduces risk"),
+    ]
+    with pytest.raises(ValueError):
+        scorer.score_token_batch(cands, tokenize_batch(["x", "y"]))
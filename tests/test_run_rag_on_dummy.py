@@ -0,0 +1,82 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from run_rag_on_dummy import iter_queries, main, run_queries
+
+NOTES = [
+    {"text": "Troponin elevated after chest pain, consistent with myocardial infarction."},
+    {"text": "Elderly patient with sepsis risk factors: immunosuppression and diabetes."},
+    {"text": "Stable cardiac patient; discharge plan includes aspirin and follow-up."},
+    {"text": "ECG shows ST elevation; cardiology consulted for catheterization."},
+]
+QUERIES = [f"Is troponin elevation case {i} diagnostic of infarction?" for i in range(7)]
+
+
+@pytest.fixture
+def workdir(tmp_path: Path, monkeypatch):
+    samples = tmp_path / "data" / "samples"
+    samples.mkdir(parents=True)
+    (samples / "mimic_notes.json").write_text(json.dumps(NOTES))
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def _records(path: Path):
+    return sorted((json.loads(l) for l in path.read_text().splitlines()), key=lambda r: r["id"])
+
+
+def test_iter_queries_ids(tmp_path: Path):
+    txt = tmp_path / "q.txt"
+    txt.write_text("first\n\nsecond\n")
+    assert list(iter_queries(str(txt))) == [{"id": "q0", "index": 0, "query": "first"},
+                                            {"id": "q1", "index": 1, "query": "second"}]
+    jl = tmp_path / "q.jsonl"
+    jl.write_text(json.dumps({"id": "a", "query": "x"}) + "\n" + json.dumps({"query": "y"}) + "\n")
+    assert list(iter_queries(str(jl))) == [{"id": "a", "index": 0, "query": "x"},
+                                           {"id": "q1", "index": 1, "query": "y"}]
+
+
+def test_run_queries_matches_across_workers_and_resumes(workdir: Path):
+    qf = workdir / "queries.txt"
+    qf.write_text("\n".join(QUERIES) + "\n")
+    one, two = workdir / "w1.jsonl", workdir / "w2.jsonl"
+    assert run_queries(str(qf), str(one), workers=1, chunk_size=2) == len(QUERIES)
+    assert run_queries(str(qf), str(two), workers=2, chunk_size=3) == len(QUERIES)
+    assert _records(one) == _records(two)
+    assert run_queries(str(qf), str(one), workers=1) == 0  # nothing left to do
+
+    # partial run, then a crash mid-write of the next chunk
+    head = workdir / "head.txt"
+    head.write_text("\n".join(QUERIES[:3]) + "\n")
+    out = workdir / "resumed.jsonl"
+    assert run_queries(str(head), str(out), workers=1, chunk_size=2) == 3
+    with open(out, "a") as f:
+        f.write('{"id": "q3", "quer')
+    assert run_queries(str(qf), str(out), workers=2, chunk_size=2) == len(QUERIES) - 3
+    assert _records(out) == _records(one)
+
+
+@pytest.mark.parametrize("max_iterations,rounds", [(1, {1}), (3, {2})])
+def test_main_reads_max_iterations_from_config(workdir: Path, max_iterations, rounds):
+    qf = workdir / "queries.txt"
+    qf.write_text("\n".join(QUERIES[:3]) + "\n")
+    cfg = workdir / "config.yaml"
+    cfg.write_text(f"inference:\n  max_iterations: {max_iterations}\n")
+    out = workdir / "out.jsonl"
+    main(["--queries", str(qf), "--out", str(out), "--workers", "1", "--config", str(cfg), "--nli-cache", ""])
+    # 4 notes and k=5: the expanded query cannot change the top-k, so feedback stops after round 2
+    assert {r["retrieval_rounds"] for r in _records(out)} == rounds
+
+
+def test_main_uses_config_nli_cache_and_trust_does_not_collapse(workdir: Path):
+    qf = workdir / "queries.txt"
+    qf.write_text("\n".join(QUERIES) + "\n")
+    cfg = workdir / "config.yaml"
+    cfg.write_text("fact_checking:\n  nli_backend: lexical\n  nli_cache_path: cache/nli.sqlite\n")
+    out = workdir / "out.jsonl"
+    main(["--queries", str(qf), "--out", str(out), "--workers", "1", "--config", str(cfg)])
+    assert (workdir / "cache" / "nli.sqlite").exists()
+    recs = _records(out)
+    assert all(1.0 < r["trust"] < 5.0 for r in recs) and len({r["trust"] for r in recs}) > 1
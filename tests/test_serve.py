@@ -0,0 +1,96 @@
+import asyncio
+
+import pytest
+
+from biomed_rag.rag_wrapper import RAGSystem
+from biomed_rag.serve import MicroBatcher, create_app
+
+CORPUS = [
+    "Aspirin reduces risk of myocardial infarction",
+    "ECG shows ST elevation in acute MI",
+    "Troponin levels are elevated in cardiac injury",
+]
+
+
+def test_micro_batcher_groups_and_coalesces():
+    calls = []
+
+    def batch_fn(keys):
+        calls.append(list(keys))
+        return [k.upper() for k in keys]
+
+    async def run():
+        b = MicroBatcher(batch_fn, max_batch_size=8, max_latency_ms=20)
+        out = await asyncio.gather(*(b.submit(k) for k in ["a", "b", "a", "c"]))
+        b.close()
+        return out, b.stats
+
+    out, stats = asyncio.run(run())
+    assert out == ["A", "B", "A", "C"]
+    assert calls == [["a", "b", "c"]]
+    assert stats["coalesced"] == 1 and stats["batches"] == 1
+
+
+def test_micro_batcher_respects_max_batch_size():
+    sizes = []
+
+    def batch_fn(keys):
+        sizes.append(len(keys))
+        return keys
+
+    async def run():
+        b = MicroBatcher(batch_fn, max_batch_size=2, max_latency_ms=50)
+        out = await asyncio.gather(*(b.submit(i) for i in range(5)))
+        b.close()
+        return out
+
+    assert asyncio.run(run()) == list(range(5))
+    assert max(sizes) <= 2 and sum(sizes) == 5
+
+
+def test_micro_batcher_propagates_errors():
+    def batch_fn(keys):
+        raise RuntimeError("boom")
+
+    async def run():
+        b = MicroBatcher(batch_fn, max_batch_size=4, max_latency_ms=1)
+        try:
+            await b.submit("x")
+        finally:
+            b.close()
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(run())
+
+
+def test_micro_batcher_fails_short_batch_results():
+    async def run():
+        b = MicroBatcher(lambda keys: keys[:1], max_batch_size=4, max_latency_ms=1)
+        try:
+            return await asyncio.wait_for(
+                asyncio.gather(b.submit("x"), b.submit("y"), return_exceptions=True), timeout=5)
+        finally:
+            b.close()
+
+    out = asyncio.run(run())
+    assert all(isinstance(r, RuntimeError) for r in out)
+
+
+def test_retrieve_batch_matches_retrieve():
+    rag = RAGSystem(CORPUS)
+    queries = ["ST elevation MI", "troponin cardiac"]
+    batch = rag.retriever.retrieve_batch(queries, k=2)
+    for q, res in zip(queries, batch):
+        assert res == rag.retriever.retrieve(q, k=2)
+
+
+def test_app_endpoints():
+    testclient = pytest.importorskip("fastapi.testclient")
+    app = create_app(RAGSystem(CORPUS), max_batch_size=4, max_latency_ms=1)
+    with testclient.TestClient(app) as client:
+        r = client.post("/retrieve", json={"query": "ST elevation MI", "k": 2})
+        assert r.status_code == 200 and len(r.json()["docs"]) == 2
+        r = client.post("/rag", json={"query": "Troponin elevation"})
+        body = r.json()
+        assert 0.0 <= body["trust"] <= 5.0 and body["heatmap_path"] == ""
+        assert client.get("/stats").json()["rag"]["requests"] == 1
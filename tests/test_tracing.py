@@ -0,0 +1,49 @@
+from pathlib import Path
+
+import pytest
+
+from biomed_rag.rag_wrapper import RAGSystem
+from biomed_rag.retriever.hybrid_retriever import HybridRetriever
+from biomed_rag.tracing import HistogramSink, NULL_TRACER, Tracer
+
+
+def test_null_tracer_is_default():
+    retr = HybridRetriever()
+    assert retr.tracer is NULL_TRACER
+    with retr.tracer.span("x"):
+        retr.tracer.incr("y")
+
+
+def test_histogram_quantiles():
+    sink = HistogramSink(growth=1.01)
+    for ms in range(1, 101):
+        sink.record_span("stage", ms / 1000.0)
+    s = sink.summary()["stage"]
+    assert s["count"] == 100
+    assert s["mean"] == pytest.approx(0.0505)
+    assert s["p50"] == pytest.approx(0.050, rel=0.02)
+    assert s["p99"] == pytest.approx(0.099, rel=0.02)
+    assert sink.quantile("missing", 0.5) == 0.0
+
+
+def test_retriever_spans_and_counters():
+    tracer = Tracer()
+    retr = HybridRetriever(tracer=tracer)
+    retr.add_documents(["alpha beta", "beta gamma", "delta"])
+    retr.retrieve("beta gamma", k=2)
+    summary = tracer.sink.summary()
+    for stage in ("tokenize", "lexical", "dense", "fusion", "sort"):
+        assert summary[f"retrieve.{stage}"]["count"] == 1
+    assert tracer.sink.counters == {"docs_scored": 3, "postings_touched": 3}
+
+
+def test_rag_spans_and_prometheus(tmp_path: Path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    tracer = Tracer()
+    rag = RAGSystem(["Troponin elevated in MI", "Aspirin for MI"], tracer=tracer)
+    rag.process("Troponin MI")
+    names = set(tracer.sink.summary())
+    assert {"rag.retrieve", "rag.answer", "rag.fact_score", "rag.trust", "rag.render"} <= names
+    text = tracer.sink.prometheus_text()
+    assert 'biomed_rag_stage_seconds{stage="rag.render",quantile="0.99"}' in text
+    assert "biomed_rag_docs_scored_total 2" in text
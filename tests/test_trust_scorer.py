@@ -24,3 +24,31 @@ def test_trust_score_custom_weights():
         weights={"C": 0.5, "Tr": 0.25, "F": 0.25}
     )
     assert 0.0 <= score <= 5.0
+
+
+def test_trust_score_batch_matches_scalar():
+    import numpy as np
+    from biomed_rag.trust.trust_scorer import compute_trust_score_batch
+
+    rng = np.random.default_rng(0)
+    em = rng.uniform(-0.2, 1.2, 1000)
+    rl = rng.integers(0, 15, 1000)
+    fs = rng.uniform(-0.2, 1.2, 1000)
+    w = {"C": 0.5, "Tr": 0.25, "F": 0.25}
+    for weights in (None, w):
+        out = compute_trust_score_batch(em, rl, fs, weights=weights)
+        expected = [compute_trust_score(a, int(b), c, weights=weights)
+                    for a, b, c in zip(em.tolist(), rl.tolist(), fs.tolist())]
+        assert out.tolist() == expected
+
+
+def test_trust_score_batch_matches_scalar_on_nan_and_out_of_range():
+    import numpy as np
+    from biomed_rag.trust.trust_scorer import compute_trust_score_batch
+
+    em = np.array([np.nan, 1.5, -0.5, np.inf, -np.inf, 0.3, np.nan])
+    rl = np.array([3.0, np.nan, 40.0, -5.0, 0.0, np.inf, np.nan])
+    fs = np.array([0.2, np.nan, 2.0, -1.0, np.nan, 0.7, np.nan])
+    out = compute_trust_score_batch(em, rl, fs)
+    expected = [compute_trust_score(a, b, c) for a, b, c in zip(em.tolist(), rl.tolist(), fs.tolist())]
+    assert out.tolist() == expected
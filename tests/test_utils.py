@@ -45,3 +45,94 @@ def test_json_io_roundtrip(tmp_path: Path):
     outp = tmp_path / "dir" / "obj.json"
     write_json(str(outp), {"x": 1})
     assert outp.exists()
+
+
+def test_query_rng_matches_seedsequence_spawn():
+    import numpy as np
+    from biomed_rag.utils import query_rng
+
+    children = np.random.SeedSequence(42).spawn(4)
+    for i, child in enumerate(children):
+        assert query_rng(42, i).random() == np.random.default_rng(child).random()
+    assert query_rng(42, 0).random() != query_rng(42, 1).random()
+
+
+def test_iter_json_array_small_chunks(tmp_path: Path):
+    from biomed_rag.utils import iter_json_array
+
+    records = [{"q": "x" * 50, "n": i, "nested": [1.5, {"s": "a]b,c"}]} for i in range(40)] + [12345, "tail", None]
+    fp = tmp_path / "arr.json"
+    fp.write_text(json.dumps(records, indent=2))
+    for chunk in (1, 3, 7, 1 << 16):
+        assert list(iter_json_array(str(fp), chunk_size=chunk)) == records
+    fp.write_text(" [ ] ")
+    assert list(iter_json_array(str(fp))) == []
+
+
+def test_iter_json_array_stops_early_and_rejects_bad_input(tmp_path: Path):
+    from itertools import islice
+    from biomed_rag.utils import iter_json_array
+
+    fp = tmp_path / "arr.json"
+    fp.write_text('[{"a": 1}, {"a": 2}, {"a": ')  # truncated tail is never read
+    assert list(islice(iter_json_array(str(fp), chunk_size=4), 2)) == [{"a": 1}, {"a": 2}]
+    with pytest.raises(ValueError):
+        list(iter_json_array(str(fp)))
+    fp.write_text('{"a": 1}')
+    with pytest.raises(ValueError):
+        list(iter_json_array(str(fp)))
+    fp.write_text('[1 2]')
+    with pytest.raises(ValueError):
+        list(iter_json_array(str(fp)))
+
+
+def _upper_notes(recs):
+    return [dict(r, note=r["note"].upper()) for r in recs]
+
+
+def test_read_jsonl_parallel_ordered_and_unordered(tmp_path: Path):
+    from biomed_rag.utils import jsonl_byte_ranges, read_jsonl_parallel
+
+    records = [{"i": i, "note": f"note {i} " * (i % 7)} for i in range(500)]
+    fp = tmp_path / "notes.jsonl"
+    fp.write_text("\n".join(json.dumps(r) for r in records) + "\n\n")
+    ranges = jsonl_byte_ranges(str(fp), chunk_bytes=1000)
+    assert ranges[0][0] == 0 and ranges[-1][1] == fp.stat().st_size
+    assert all(a[1] == b[0] for a, b in zip(ranges, ranges[1:]))
+
+    expected = _upper_notes(records)
+    for workers in (1, 2):
+        out = list(read_jsonl_parallel(str(fp), transform=_upper_notes, workers=workers, chunk_bytes=1000))
+        assert out == expected
+    out = list(read_jsonl_parallel(str(fp), workers=2, chunk_bytes=1000, ordered=False, prefetch=2))
+    assert sorted(out, key=lambda r: r["i"]) == records
+
+
+def test_read_jsonl_parallel_stays_in_process(tmp_path: Path, monkeypatch):
+    import biomed_rag.utils as utils
+
+    def no_pool(*args, **kwargs):
+        raise AssertionError("process pool started")
+
+    monkeypatch.setattr(utils, "ProcessPoolExecutor", no_pool)
+    fp = tmp_path / "small.jsonl"
+    fp.write_text("\n".join(json.dumps({"i": i}) for i in range(5)) + "\n")
+    for workers in (0, 1, None):  # None: a single chunk needs no pool
+        assert [r["i"] for r in utils.read_jsonl_parallel(str(fp), workers=workers)] == list(range(5))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 64])
+def test_iter_json_array_numbers_split_across_chunks(tmp_path: Path, chunk_size):
+    import random
+    from biomed_rag.utils import iter_json_array
+
+    rng = random.Random(chunk_size)
+    for trial in range(50):
+        values = [rng.choice([rng.randint(-10**6, 10**6), rng.uniform(-1e3, 1e3), rng.uniform(-1, 1) * 1e-20,
+                              True, None, "s"]) for _ in range(rng.randint(0, 20))]
+        text = json.dumps(values, separators=(",", ":") if trial % 2 else (", ", ": "))
+        fp = tmp_path / "a.json"
+        fp.write_text(text)
+        assert list(iter_json_array(str(fp), chunk_size=chunk_size)) == json.loads(text)
+    fp.write_text("[1, 10.5, 2.25, 3e5, -0.125e-3]")
+    assert list(iter_json_array(str(fp), chunk_size=chunk_size)) == [1, 10.5, 2.25, 3e5, -0.125e-3]